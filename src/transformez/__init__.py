@@ -13,54 +13,22 @@ __version__ = "0.1.1"
 __author__ = "Matthew Love"
 __credits__ = "CIRES"
 
-import os
-import glob
+from ._proj import _ensure_proj_lib
 
-def _find_proj_lib():
-    """Locate the best available PROJ_LIB path."""
-    
-    try:
-        import rasterio
-        r_path = os.path.join(os.path.dirname(rasterio.__file__), 'proj_data')
-        if os.path.exists(os.path.join(r_path, 'proj.db')):
-            return r_path
-            
-        parent = os.path.dirname(os.path.dirname(rasterio.__file__))
-        libs = glob.glob(os.path.join(parent, 'rasterio.libs*'))
-        if libs:
-            for root, _, files in os.walk(libs[0]):
-                if 'proj.db' in files:
-                    return root
-    except ImportError:
-        pass
-
-    try:
-        import pyproj
-        p_path = pyproj.datadir.get_data_dir()
-        if os.path.exists(os.path.join(p_path, 'proj.db')):
-            return p_path
-    except ImportError:
-        pass
-        
-    return None
-
-target_proj_lib = _find_proj_lib()
-
-if 'PROJ_LIB' in os.environ:
-    del os.environ['PROJ_LIB']
-
-if target_proj_lib:
-    os.environ['PROJ_LIB'] = target_proj_lib
-    # print(f"DEBUG: PROJ_LIB set to {target_proj_lib}")
-
-from .hooks import TransformezHook
-from fetchez.hooks.registry import HookRegistry
+_FETCHEZ_READY = False
 
 def setup_fetchez(registry_cls):
     """Called by fetchez when loading plugins.
     Registers modules, hooks, and presets.
     """
 
+    global _FETCHEZ_READY
+    if _FETCHEZ_READY:
+        return
+
+    from fetchez.hooks.registry import HookRegistry
+    from .hooks import TransformezHook
+    
     HookRegistry.register_hook(TransformezHook)
     
     from fetchez.presets import register_global_preset    
@@ -73,6 +41,9 @@ def setup_fetchez(registry_cls):
         ]
     )
 
+    # only once everything is registered, so a failed import/registration is retried
+    _FETCHEZ_READY = True
+
 
     # "transform-pipeline": {
     #     "help_text": "Generate shift grid based on region, then apply it to files.",
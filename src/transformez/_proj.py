@@ -0,0 +1,140 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+transformez._proj
+~~~~~~~~~~~~~
+
+Locate the PROJ data directory (`proj.db`) and point PROJ_LIB at it.
+
+:copyright: (c) 2010-2026 Regents of the University of Colorado
+:license: MIT, see LICENSE for more details.
+"""
+
+import os
+import json
+import logging
+import importlib.util
+
+logger = logging.getLogger(__name__)
+
+PROJ_LIB_CACHE = os.path.join(os.path.expanduser('~'), '.transformez', 'proj_lib_cache.json')
+
+# Where `proj.db` usually lives inside a `rasterio.libs*` directory
+PROJ_DB_CANDIDATES = ['proj.db', 'proj_data/proj.db', 'share/proj/proj.db', 'proj/proj.db']
+
+def _proj_lib_key():
+    """Build a cheap cache key from the rasterio/pyproj install mtimes.
+
+    Uses `find_spec` so the packages are located without being imported.
+    """
+    
+    key = []
+    for mod_name in ('rasterio', 'pyproj'):
+        try:
+            spec = importlib.util.find_spec(mod_name)
+            key.append(os.stat(spec.origin).st_mtime if spec and spec.origin else None)
+        except (ImportError, ValueError, OSError):
+            key.append(None)
+            
+    return key
+
+
+def _cached_proj_lib():
+    """Return the PROJ_LIB path, using the on-disk cache when it is still valid."""
+    
+    key = _proj_lib_key()
+    try:
+        with open(PROJ_LIB_CACHE, 'r') as f:
+            cached = json.load(f)
+            
+        if cached.get('key') == key and cached.get('path') \
+           and os.path.exists(os.path.join(cached['path'], 'proj.db')):
+            return cached['path']
+    except (OSError, ValueError, AttributeError):
+        pass
+
+    proj_lib = _find_proj_lib()
+    if proj_lib:
+        try:
+            os.makedirs(os.path.dirname(PROJ_LIB_CACHE), exist_ok=True)
+            with open(PROJ_LIB_CACHE, 'w') as f:
+                json.dump({'key': key, 'path': proj_lib}, f)
+        except OSError:
+            pass
+        
+    return proj_lib
+
+
+def _find_proj_lib():
+    """Locate the best available PROJ_LIB path.
+
+    Packages are located with `find_spec` so rasterio (and GDAL) is not
+    imported just to find `proj.db`.
+    """
+    
+    try:
+        spec = importlib.util.find_spec('rasterio')
+    except (ImportError, ValueError):
+        spec = None
+        
+    if spec is not None and spec.origin:
+        r_dir = os.path.dirname(spec.origin)
+        r_path = os.path.join(r_dir, 'proj_data')
+        if os.path.exists(os.path.join(r_path, 'proj.db')):
+            return r_path
+            
+        parent = os.path.dirname(r_dir)
+        try:
+            libs = [e.path for e in os.scandir(parent)
+                    if e.name.startswith('rasterio.libs') and e.is_dir()]
+        except OSError:
+            libs = []
+            
+        if libs:
+            for candidate in PROJ_DB_CANDIDATES:
+                if os.path.isfile(os.path.join(libs[0], candidate)):
+                    return os.path.dirname(os.path.join(libs[0], candidate))
+                
+            for root, _, files in os.walk(libs[0], followlinks=False):
+                if 'proj.db' in files:
+                    return root
+
+    try:
+        import pyproj
+        p_path = pyproj.datadir.get_data_dir()
+        if os.path.exists(os.path.join(p_path, 'proj.db')):
+            return p_path
+    except ImportError:
+        pass
+        
+    return None
+
+
+_PROJ_LIB_READY = False
+
+def _ensure_proj_lib():
+    """Point PROJ_LIB at the best available `proj.db`, once per process.
+
+    Call this before importing rasterio or pyproj.
+    """
+
+    global _PROJ_LIB_READY
+    if _PROJ_LIB_READY:
+        return
+
+    try:
+        target_proj_lib = _cached_proj_lib()
+    except OSError as e:
+        # Leave the flag unset so a later call can retry
+        logger.debug(f'PROJ_LIB discovery failed: {e}')
+        return
+    
+    _PROJ_LIB_READY = True
+
+    # Leave an existing PROJ_LIB alone if it already matches or if discovery found nothing
+    if target_proj_lib and os.environ.get('PROJ_LIB') != target_proj_lib:
+        os.environ['PROJ_LIB'] = target_proj_lib
+        logger.debug(f'PROJ_LIB set to {target_proj_lib}')
+
+        
@@ -16,16 +16,13 @@ import os
 import sys
 import argparse
 import logging
+import functools
 
-import rasterio
-
-from . import __version__
-from .transform import VerticalTransform
+from . import __version__, _ensure_proj_lib
 from .definitions import Datums
-from .grid_engine import plot_grid, GridWriter, GridEngine
+from .utils import parse_increment
 
 from fetchez import spatial
-from fetchez import utils
 from fetchez.spatial import parse_region
 
 logging.basicConfig(level=logging.INFO, format='[ %(levelname)s ] %(name)s: %(message)s', stream=sys.stderr)
@@ -33,32 +30,45 @@ logger = logging.getLogger(__name__)
 
 logging.getLogger('fetchez').setLevel(logging.WARNING)
 
+@functools.lru_cache(maxsize=128)
 def parse_compound_datum(datum_arg):
     """Parse a datum string that might contain a geoid override.
     Format: "EPSG" or "EPSG:GEOID" or "NAME:GEOID"
     """
-    if ':' in str(datum_arg):
-        parts = str(datum_arg).split(':')
-        datum = Datums.get_vdatum_by_name(parts[0])
-        geoid = parts[1]
-        return datum, geoid
+    if isinstance(datum_arg, str) and ':' in datum_arg:
+        datum_name, geoid = datum_arg.split(':', 1)
+        return Datums.get_vdatum_by_name(datum_name), geoid
     else:
         return Datums.get_vdatum_by_name(datum_arg), None
 
     
 def get_grid_info(filename):
     """Extract region, resolution, and SRS from a raster using Rasterio."""
+
+    _ensure_proj_lib()
+    import rasterio
     
-    with rasterio.open(filename) as ds:
-        bounds = ds.bounds # left, bottom, right, top
+    # For remote rasters, skip the directory listing and sidecar probes (each
+    # one a round trip). Local files keep them: world files, .aux.xml and
+    # EHdr headers carry the georeferencing.
+    fn = str(filename)
+    env_opts = {}
+    if fn.startswith('/vsi') or '://' in fn:
+        env_opts = dict(GDAL_DISABLE_READDIR_ON_OPEN='EMPTY_DIR',
+                        CPL_VSIL_CURL_ALLOWED_EXTENSIONS='.tif,.tiff,.vrt',
+                        GDAL_INGESTED_BYTES_AT_OPEN=16384)
+
+    # Avoid GDAL's shared dataset handles
+    with rasterio.Env(**env_opts), rasterio.open(filename, sharing=False) as ds:
+        left, bottom, right, top = ds.bounds
         width = ds.width
         height = ds.height
         gt = ds.transform.to_gdal() # (c, a, b, f, d, e)
         srs_wkt = ds.crs.to_wkt() if ds.crs else None
         
         return {
-            'te': (bounds.left, bounds.bottom, bounds.right, bounds.top),
-            'region': (bounds.left, bounds.right, bounds.bottom, bounds.top),
+            'te': (left, bottom, right, top),
+            'region': (left, right, bottom, top),
             'nx': width,
             'ny': height,
             'gt': gt,
@@ -66,7 +76,18 @@ def get_grid_info(filename):
         }
 
 
+def _print_epsg_tables():
+    """Write the supported EPSG tables to stdout."""
+    
+    sys.stdout.write(Datums._EPSG_LIST_TEXT)
+
+    
 def transformez_cli():
+    # Answer --list-epsg without building the parser
+    if '-l' in sys.argv[1:] or '--list-epsg' in sys.argv[1:]:
+        _print_epsg_tables()
+        sys.exit(0)
+        
     parser = argparse.ArgumentParser(
         description=f'%(prog)s ({__version__}): Generate a vertical transformation grid',
         formatter_class=argparse.RawTextHelpFormatter,
@@ -78,7 +99,9 @@ def transformez_cli():
     input_grp.add_argument('--dem', help='Input DEM to transform. Automatically sets Region and Resolution.')
     
     sel_grp = parser.add_argument_group('Geospatial Selection')
-    sel_grp.add_argument('-E', '--increment', help='Grid resolution (e.g. 0.0001 or 1s) (Required if not using --dem).')
+    sel_grp.add_argument('-E', '--increment', help='Grid resolution (e.g. 0.0001 or 1s) (Required if not using --dem).\n'
+                         'Units: s/c arc-seconds, m arc-minutes (1m = 1/60 degree), d degrees,\n'
+                         't meters (1t = 1/111320 degree).')
 
     datum_group = parser.add_argument_group('Datum Configuration')    
     datum_group.add_argument('-I', '--vdatum_in', default='5703', 
@@ -109,20 +132,17 @@ def transformez_cli():
         logger.setLevel(logging.WARNING)
 
     if args.list_epsg:
-        def _print_epsg(title, data):
-            print(f'{title}:')
-            for key, val in data.items():
-                print(f'  {key}\t{val["name"]}')
-        
-        _print_epsg('HTDP EPSG', Datums.HTDP)
-        _print_epsg('CDN EPSG', Datums.CDN)
-        _print_epsg('Tidal EPSG', Datums.TIDAL)
+        _print_epsg_tables()
         sys.exit(0)
 
     cache_dir = args.cache_dir or os.path.join(os.path.expanduser('~'), '.transformez')
-    if not os.path.exists(cache_dir):
-        os.makedirs(cache_dir)
+    os.makedirs(cache_dir, exist_ok=True)
 
+    # These pull in rasterio/pyproj, so only import them once we have work to do.
+    _ensure_proj_lib()
+    from .transform import VerticalTransform
+    from .grid_engine import plot_grid, GridWriter, GridEngine
+    
     epsg_in, geoid_in = parse_compound_datum(args.vdatum_in)
     epsg_out, geoid_out = parse_compound_datum(args.vdatum_out)
 
@@ -158,11 +178,7 @@ def transformez_cli():
         region_obj = these_regions[0]
 
         try:
-            if '/' in args.increment:
-                inc_x, inc_y = [float(x) for x in args.increment.split('/')]
-            else:
-                inc_val = utils.str2inc(args.increment)
-                inc_x, inc_y = inc_val, inc_val
+            inc_x, inc_y = parse_increment(args.increment)
                 
             width = region_obj.width
             height = region_obj.height
@@ -13,9 +13,46 @@ and definitions.
 """
 
 import logging
+import functools
+from typing import NamedTuple, Optional
 
 logger = logging.getLogger(__name__)
 
+class SurfaceEntry(NamedTuple):
+    """A tidal/hydraulic surface definition."""
+    
+    name: str
+    description: str
+    uncertainty: float
+    epsg: int
+    
+    frame = 'surface'
+
+    
+class HtdpEntry(NamedTuple):
+    """An ellipsoidal frame definition handled by HTDP."""
+    
+    name: str
+    description: str
+    htdp_id: int
+    uncertainty: float
+    epoch: float
+    
+    frame = 'htdp'
+
+    
+class CdnEntry(NamedTuple):
+    """An orthometric (geoid-based) datum definition."""
+    
+    name: str
+    vdatum_id: Optional[str] = None
+    default_geoid: Optional[str] = None
+    ellipsoid: Optional[int] = None
+    
+    frame = 'cdn'
+
+    
+
 class Datums:
     """Class to manage vertical datum definitions and lookups."""
 
@@ -24,92 +61,92 @@ class Datums:
     # =========================================================================
     SURFACES = {
         # --- Tidal Datums ---
-        1089: {'name': 'mllw', 'description': 'Mean Lower Low Water', 'uncertainty': 0, 'epsg': 5866},
-        5866: {'name': 'mllw', 'description': 'Mean Lower Low Water', 'uncertainty': 0, 'epsg': 5866},
-        1091: {'name': 'mlw',  'description': 'Mean Low Water', 'uncertainty': 0, 'epsg': 1091},
-        5869: {'name': 'mhhw', 'description': 'Mean Higher High Water', 'uncertainty': 0, 'epsg': 5869},
-        5868: {'name': 'mhw', 'description': 'Mean High Water', 'uncertainty': 0, 'epsg': 5868},
-        5714: {'name': 'msl', 'description': 'Mean Sea Level', 'uncertainty': 0, 'epsg': 5714},
-        5713: {'name': 'mtl', 'description': 'Mean Tide Level', 'uncertainty': 0, 'epsg': 5713},
+        1089: SurfaceEntry('mllw', 'Mean Lower Low Water', 0, 5866),
+        5866: SurfaceEntry('mllw', 'Mean Lower Low Water', 0, 5866),
+        1091: SurfaceEntry('mlw', 'Mean Low Water', 0, 1091),
+        5869: SurfaceEntry('mhhw', 'Mean Higher High Water', 0, 5869),
+        5868: SurfaceEntry('mhw', 'Mean High Water', 0, 5868),
+        5714: SurfaceEntry('msl', 'Mean Sea Level', 0, 5714),
+        5713: SurfaceEntry('mtl', 'Mean Tide Level', 0, 5713),
         
         # --- Hydraulic / River Datums ---
         # Columbia River Datum (No standard EPSG, using 0 placeholder or custom)
-        0:    {'name': 'crd', 'description': 'Columbia River Datum', 'uncertainty': 0, 'epsg': 0},
+        0:    SurfaceEntry('crd', 'Columbia River Datum', 0, 0),
         
         # IGLD 1985 (Dynamic Height)
-        5609: {'name': 'IGLD85', 'description': 'International Great Lakes Datum 1985', 'uncertainty': 0, 'epsg': 5609},
+        5609: SurfaceEntry('IGLD85', 'International Great Lakes Datum 1985', 0, 5609),
         
         # IGLD Low Water Datum (Chart Datum for Lakes)
         # VDatum uses 'LWD_IGLD85' string
-        9000: {'name': 'LWD_IGLD85', 'description': 'IGLD85 Low Water Datum', 'uncertainty': 0, 'epsg': 5609},
+        9000: SurfaceEntry('LWD_IGLD85', 'IGLD85 Low Water Datum', 0, 5609),
         
         # --- Legacy Vertical ---
         # NGVD29 is often best handled via VDatum (VERTCON) if PROJ isn't configured
-        5702: {'name': 'NGVD29', 'description': 'National Geodetic Vertical Datum 1929', 'uncertainty': 0.05, 'epsg': 5702},
+        5702: SurfaceEntry('NGVD29', 'National Geodetic Vertical Datum 1929', 0.05, 5702),
     }
 
     HTDP = {
-        4269: {'name': 'NAD_83(2011/CORS96/2007)', 'description': '(North American plate fixed)', 'htdp_id': 1, 'uncertainty': .02, 'epoch': 1997.0},
-        6781: {'name': 'NAD_83(2011/CORS96/2007)', 'description': '(North American plate fixed)', 'htdp_id': 1, 'uncertainty': .02, 'epoch': 1997.0},
-        6319: {'name': 'NAD_83(2011/CORS96/2007)', 'description': '(North American plate fixed)', 'htdp_id': 1, 'uncertainty': .02, 'epoch': 1997.0},
-        6321: {'name': 'NAD_83(PA11/PACP00)', 'description': '(Pacific plate fixed)', 'htdp_id': 2, 'uncertainty': .02, 'epoch': 1997.0},
-        6324: {'name': 'NAD_83(MA11/MARP00)', 'description': '(Mariana plate fixed)', 'htdp_id': 3, 'uncertainty': .02, 'epoch': 1997.0},
-        4979: {'name': 'WGS_84(original)', 'description': '(NAD_83(2011) used)', 'htdp_id': 4, 'uncertainty': 0, 'epoch': 1997.0},
-        7815: {'name': 'WGS_84(original)', 'description': '(NAD_83(2011) used)', 'htdp_id': 4, 'uncertainty': 0, 'epoch': 1997.0},
-        7816: {'name': 'WGS_84(original)', 'description': '(NAD_83(2011) used)', 'htdp_id': 4, 'uncertainty': 0, 'epoch': 1997.0},
-        7656: {'name': 'WGS_84(G730)', 'description': '(ITRF91 used)', 'htdp_id': 5, 'uncertainty': 0, 'epoch': 1997.0},
-        7657: {'name': 'WGS_84(G730)', 'description': '(ITRF91 used)', 'htdp_id': 5, 'uncertainty': 0, 'epoch': 1997.0},
-        7658: {'name': 'WGS_84(G873)', 'description': '(ITRF94 used)', 'htdp_id': 6, 'uncertainty': 0, 'epoch': 1997.0},
-        7659: {'name': 'WGS_84(G873)', 'description': '(ITRF94 used)', 'htdp_id': 6, 'uncertainty': 0, 'epoch': 1997.0},
-        7660: {'name': 'WGS_84(G1150)', 'description': '(ITRF2000 used)', 'htdp_id': 7, 'uncertainty': 0, 'epoch': 1997.0},
-        7661: {'name': 'WGS_84(G1150)', 'description': '(ITRF2000 used)', 'htdp_id': 7, 'uncertainty': 0, 'epoch': 1997.0},
-        7662: {'name': 'WGS_84(G1674)', 'description': '(ITRF2008 used)', 'htdp_id': 8, 'uncertainty': 0, 'epoch': 2000.0},
-        7663: {'name': 'WGS_84(G1674)', 'description': '(ITRF2008 used)', 'htdp_id': 8, 'uncertainty': 0, 'epoch': 2000.0},
-        7664: {'name': 'WGS_84(G1762)', 'description': '(IGb08 used)', 'htdp_id': 9, 'uncertainty': 0, 'epoch': 2000.0},
-        7665: {'name': 'WGS_84(G1762)', 'description': '(IGb08 used)', 'htdp_id': 9, 'uncertainty': 0, 'epoch': 2000.0},
-        7666: {'name': 'WGS_84(G2139)', 'description': '(ITRF2014=IGS14=IGb14 used)', 'htdp_id': 10, 'uncertainty': 0, 'epoch': 1997.0},
-        7667: {'name': 'WGS_84(G2139)', 'description': '(ITRF2014=IGS14=IGb14 used)', 'htdp_id': 10, 'uncertainty': 0, 'epoch': 1997.0},
-        4910: {'name': 'ITRF88', 'description': '', 'htdp_id': 11, 'uncertainty': 0, 'epoch': 1988.0},
-        4911: {'name': 'ITRF89', 'description': '', 'htdp_id': 12, 'uncertainty': 0, 'epoch': 1988.0},
-        7901: {'name': 'ITRF89', 'description': '', 'htdp_id': 12, 'uncertainty': 0, 'epoch': 1988.0},
-        7902: {'name': 'ITRF90', 'description': '(PNEOS90/NEOS90)', 'htdp_id': 13, 'uncertainty': 0, 'epoch': 1988.0},
-        7903: {'name': 'ITRF91', 'description': '', 'htdp_id': 14, 'uncertainty': 0, 'epoch': 1988.0},
-        7904: {'name': 'ITRF92', 'description': '', 'htdp_id': 15, 'uncertainty': 0, 'epoch': 1988.0},
-        7905: {'name': 'ITRF93', 'description': '', 'htdp_id': 16, 'uncertainty': 0, 'epoch': 1988.0},
-        7906: {'name': 'ITRF94', 'description': '', 'htdp_id': 17, 'uncertainty': 0, 'epoch': 1988.0},
-        7907: {'name': 'ITRF96', 'description': '', 'htdp_id': 18, 'uncertainty': 0, 'epoch': 1996.0},
-        7908: {'name': 'ITRF97', 'description': 'IGS97', 'htdp_id': 19, 'uncertainty': 0, 'epoch': 1997.0},
-        7909: {'name': 'ITRF2000', 'description': 'IGS00/IGb00', 'htdp_id': 20, 'uncertainty': 0, 'epoch': 2000.0},
-        7910: {'name': 'ITRF2005', 'description': 'IGS05', 'htdp_id': 21, 'uncertainty': 0, 'epoch': 2000.0},
-        7911: {'name': 'ITRF2008', 'description': 'IGS08/IGb08', 'htdp_id': 22, 'uncertainty': 0, 'epoch': 2000.0},
-        7912: {'name': 'ELLIPSOID', 'description': 'IGS14/IGb14/WGS84/ITRF2014 Ellipsoid', 'htdp_id': 23, 'uncertainty': 0, 'epoch': 2000.0},
-        1322: {'name': 'ITRF2020', 'description': 'IGS20', 'htdp_id': 24, 'uncertainty': 0, 'epoch': 2000.0},
+        4269: HtdpEntry('NAD_83(2011/CORS96/2007)', '(North American plate fixed)', 1, .02, 1997.0),
+        6781: HtdpEntry('NAD_83(2011/CORS96/2007)', '(North American plate fixed)', 1, .02, 1997.0),
+        6319: HtdpEntry('NAD_83(2011/CORS96/2007)', '(North American plate fixed)', 1, .02, 1997.0),
+        6321: HtdpEntry('NAD_83(PA11/PACP00)', '(Pacific plate fixed)', 2, .02, 1997.0),
+        6324: HtdpEntry('NAD_83(MA11/MARP00)', '(Mariana plate fixed)', 3, .02, 1997.0),
+        4979: HtdpEntry('WGS_84(original)', '(NAD_83(2011) used)', 4, 0, 1997.0),
+        7815: HtdpEntry('WGS_84(original)', '(NAD_83(2011) used)', 4, 0, 1997.0),
+        7816: HtdpEntry('WGS_84(original)', '(NAD_83(2011) used)', 4, 0, 1997.0),
+        7656: HtdpEntry('WGS_84(G730)', '(ITRF91 used)', 5, 0, 1997.0),
+        7657: HtdpEntry('WGS_84(G730)', '(ITRF91 used)', 5, 0, 1997.0),
+        7658: HtdpEntry('WGS_84(G873)', '(ITRF94 used)', 6, 0, 1997.0),
+        7659: HtdpEntry('WGS_84(G873)', '(ITRF94 used)', 6, 0, 1997.0),
+        7660: HtdpEntry('WGS_84(G1150)', '(ITRF2000 used)', 7, 0, 1997.0),
+        7661: HtdpEntry('WGS_84(G1150)', '(ITRF2000 used)', 7, 0, 1997.0),
+        7662: HtdpEntry('WGS_84(G1674)', '(ITRF2008 used)', 8, 0, 2000.0),
+        7663: HtdpEntry('WGS_84(G1674)', '(ITRF2008 used)', 8, 0, 2000.0),
+        7664: HtdpEntry('WGS_84(G1762)', '(IGb08 used)', 9, 0, 2000.0),
+        7665: HtdpEntry('WGS_84(G1762)', '(IGb08 used)', 9, 0, 2000.0),
+        7666: HtdpEntry('WGS_84(G2139)', '(ITRF2014=IGS14=IGb14 used)', 10, 0, 1997.0),
+        7667: HtdpEntry('WGS_84(G2139)', '(ITRF2014=IGS14=IGb14 used)', 10, 0, 1997.0),
+        4910: HtdpEntry('ITRF88', '', 11, 0, 1988.0),
+        4911: HtdpEntry('ITRF89', '', 12, 0, 1988.0),
+        7901: HtdpEntry('ITRF89', '', 12, 0, 1988.0),
+        7902: HtdpEntry('ITRF90', '(PNEOS90/NEOS90)', 13, 0, 1988.0),
+        7903: HtdpEntry('ITRF91', '', 14, 0, 1988.0),
+        7904: HtdpEntry('ITRF92', '', 15, 0, 1988.0),
+        7905: HtdpEntry('ITRF93', '', 16, 0, 1988.0),
+        7906: HtdpEntry('ITRF94', '', 17, 0, 1988.0),
+        7907: HtdpEntry('ITRF96', '', 18, 0, 1996.0),
+        7908: HtdpEntry('ITRF97', 'IGS97', 19, 0, 1997.0),
+        7909: HtdpEntry('ITRF2000', 'IGS00/IGb00', 20, 0, 2000.0),
+        7910: HtdpEntry('ITRF2005', 'IGS05', 21, 0, 2000.0),
+        7911: HtdpEntry('ITRF2008', 'IGS08/IGb08', 22, 0, 2000.0),
+        7912: HtdpEntry('ELLIPSOID', 'IGS14/IGb14/WGS84/ITRF2014 Ellipsoid', 23, 0, 2000.0),
+        1322: HtdpEntry('ITRF2020', 'IGS20', 24, 0, 2000.0),
         
     }
 
     CDN = {
         # CONUS / Alaska / Hawaii / PR / VI
-        5703: {'name': 'NAVD88 height', 'vdatum_id': 'navd88:m:height', 'default_geoid': 'g2018', 'ellipsoid': 6319},
-        6360: {'name': 'NAVD88 height (usFt)', 'default_geoid': 'g2018'},
-        8228: {'name': 'NAVD88 height (Ft)', 'default_geoid': 'g2018'},
+        5703: CdnEntry('NAVD88 height', vdatum_id='navd88:m:height', default_geoid='g2018', ellipsoid=6319),
+        6360: CdnEntry('NAVD88 height (usFt)', default_geoid='g2018'),
+        8228: CdnEntry('NAVD88 height (Ft)', default_geoid='g2018'),
 
         # Puerto Rico
-        6641: {'name': 'PRVD02 height', 'vdatum_id': 'prvd02:m:height', 'default_geoid': 'g2018', 'ellipsoid': 6319},
+        6641: CdnEntry('PRVD02 height', vdatum_id='prvd02:m:height', default_geoid='g2018', ellipsoid=6319),
         
         # Virgin Islands
-        6642: {'name': 'VIVD09 height', 'vdatum_id': 'vivd09:m:height', 'default_geoid': 'g2018', 'ellipsoid': 6319},
+        6642: CdnEntry('VIVD09 height', vdatum_id='vivd09:m:height', default_geoid='g2018', ellipsoid=6319),
 
         # Canada (CGVD2013 uses CGG2013 geoid)
         # Note: You need to ensure 'CGG2013' is fetchable via your fetcher or map it to a filename
-        6647: {'name': 'CGVD2013(CGG2013)', 'vdatum_id': 'cgvd2013:m:height', 'default_geoid': 'CGG2013'},
+        6647: CdnEntry('CGVD2013(CGG2013)', vdatum_id='cgvd2013:m:height', default_geoid='CGG2013'),
 
         # Global EGM
-        3855: {'name': 'EGM2008 height', 'vdatum_id': 'egm2008:m:height', 'default_geoid': 'egm2008'},
-        5773: {'name': 'EGM96 height', 'vdatum_id': 'egm96:m:height', 'default_geoid': 'egm96'},
+        3855: CdnEntry('EGM2008 height', vdatum_id='egm2008:m:height', default_geoid='egm2008'),
+        5773: CdnEntry('EGM96 height', vdatum_id='egm96:m:height', default_geoid='egm96'),
         
         # # Ellipsoidal (Hubs) - No Geoid needed
-        # 6319: {'name': 'NAD83(2011)', 'vdatum_id': 'nad83_2011:m:height'},
-        # 4979: {'name': 'WGS84', 'vdatum_id': 'wgs84:m:height'},
+        # 6319: CdnEntry('NAD83(2011)', vdatum_id='nad83_2011:m:height'),
+        # 4979: CdnEntry('WGS84', vdatum_id='wgs84:m:height'),
     }
     
     GEOIDS = {
@@ -137,12 +174,11 @@ class Datums:
         except:
             return None
             
-        if e_int in cls.CDN:
-            return cls.CDN[e_int].get('default_geoid')
-        return None
+        return getattr(cls._ALL.get(e_int), 'default_geoid', None)
 
     
     @classmethod
+    @functools.lru_cache(maxsize=256)
     def get_vdatum_by_name(cls, datum_name):
         """Return the vertical datum EPSG based on the vertical datum name."""
         
@@ -153,14 +189,18 @@ class Datums:
             datum_int = int(datum_name)
         except (ValueError, TypeError):
             datum_int = None
-        
-        for frame_set in [cls.SURFACES, cls.HTDP, cls.CDN]:
-            if datum_int in frame_set:
-                return datum_int
-            
-            for epsg, info in frame_set.items():
-                if str(datum_name).lower() in info['name'].lower():
-                    return epsg
+
+        if datum_int in cls._ALL:
+            return datum_int
+
+        datum_lower = str(datum_name).lower()
+        if datum_lower in cls._NAME_INDEX:
+            return cls._NAME_INDEX[datum_lower]
+
+        # Fall back to a substring match on the datum names
+        for epsg, name_lower in cls._NAMES_LC:
+            if datum_lower in name_lower:
+                return epsg
         
         return None
 
@@ -168,20 +208,43 @@ class Datums:
     @classmethod
     def get_vdatum_id(cls, epsg):
         """Retrieve the NOAA VDatum CLI string for an EPSG."""
-        if epsg in cls.SURFACES: return cls.SURFACES[epsg].get('vdatum_id')
-        if epsg in cls.CDN: return cls.CDN[epsg].get('vdatum_id')
-        if epsg == 6319: return 'nad83_2011:m:height'
-        return None
+        
+        vdatum_id = getattr(cls._ALL.get(epsg), 'vdatum_id', None)
+        if vdatum_id is None and epsg == 6319: return 'nad83_2011:m:height'
+        return vdatum_id
 
     
     @classmethod
     def get_frame_type(cls, epsg):
         """Identify which frame set an EPSG belongs to."""
         
-        if epsg in cls.SURFACES:
-            return 'surface'
-        if epsg in cls.HTDP:
-            return 'htdp'
-        if epsg in cls.CDN:
-            return 'cdn'
-        return None
+        return getattr(cls._ALL.get(epsg), 'frame', None)
+
+
+# Lookup tables, built once at import.
+# `_ALL` flattens the frame sets into one EPSG-keyed table (entries carry their `frame`);
+# `_NAME_INDEX` maps lowercased names to EPSG codes and `_NAMES_LC` keeps
+# the (epsg, lowercased name) pairs in lookup order for substring matching.
+# The first entry wins for EPSG codes/names shared by several frame sets.
+Datums._ALL = {}
+Datums._NAME_INDEX = {}
+Datums._NAMES_LC = []
+for _frame_set in [Datums.SURFACES, Datums.HTDP, Datums.CDN]:
+    for _epsg, _info in _frame_set.items():
+        Datums._ALL.setdefault(_epsg, _info)
+        Datums._NAME_INDEX.setdefault(_info.name.lower(), _epsg)
+        Datums._NAMES_LC.append((_epsg, _info.name.lower()))
+
+# geoid name -> fetchez provider module
+Datums.GEOID_PROVIDER = {
+    _geoid: _info.get('provider', 'proj') for _geoid, _info in Datums.GEOIDS.items()
+}
+
+# Pre-formatted `--list-epsg` output, per table and combined
+Datums._LIST_EPSG_LINES = {
+    _title: '\n'.join(f'  {_epsg}\t{_info.name}' for _epsg, _info in _frame_set.items())
+    for _title, _frame_set in [('HTDP EPSG', Datums.HTDP), ('CDN EPSG', Datums.CDN), ('Tidal EPSG', Datums.SURFACES)]
+}
+Datums._EPSG_LIST_TEXT = ''.join(
+    f'{_title}:\n{_lines}\n' for _title, _lines in Datums._LIST_EPSG_LINES.items()
+)
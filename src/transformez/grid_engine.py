@@ -13,13 +13,114 @@ This is the grid engine utility for combining data into a grid.
 
 import os
 import logging
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
+
+from . import _ensure_proj_lib
+_ensure_proj_lib()
+
 import rasterio
-from scipy.interpolate import RegularGridInterpolator
+import rasterio.windows
+import rasterio.warp
+from rasterio.transform import Affine
 from scipy import ndimage
 
+from . import utils
+
 logger = logging.getLogger(__name__)
 
+def _bounded_edt(mask, radius):
+    """Euclidean distance transform to the nearest False pixel in `mask`,
+    clipped at `radius` (all `fill_nans` needs for its decay).
+
+    Only pixels within `radius` of both a True and a False pixel can get a
+    distance below `radius`, so the exact EDT is run on that window only;
+    everything outside it is set to `radius`, with indices pointing at an
+    arbitrary valid pixel.
+    
+    Returns:
+        tuple: (dist (float32, (ny, nx)), indices (int32, (2, ny, nx)))
+    """
+
+    ny, nx = mask.shape
+    valid = ~mask
+    
+    def _window(invalid_lines, valid_lines, n):
+        inv = np.flatnonzero(invalid_lines)
+        val = np.flatnonzero(valid_lines)
+        return max(max(inv[0], val[0]) - radius, 0), min(min(inv[-1], val[-1]) + radius + 1, n)
+    
+    r0, r1 = _window(mask.any(axis=1), valid.any(axis=1), ny)
+    c0, c1 = _window(mask.any(axis=0), valid.any(axis=0), nx)
+
+    dist = np.full((ny, nx), radius, dtype=np.float32)
+    indices = np.empty((2, ny, nx), dtype=np.int32)
+    v_row, v_col = np.unravel_index(np.argmax(valid), mask.shape)
+    indices[0] = v_row
+    indices[1] = v_col
+
+    if r0 < r1 and c0 < c1:
+        sub = mask[r0:r1, c0:c1]
+        if not sub.all():
+            sub_dist, sub_idx = ndimage.distance_transform_edt(
+                sub,
+                return_distances=True,
+                return_indices=True
+            )
+            np.minimum(sub_dist, radius, out=sub_dist)
+            dist[r0:r1, c0:c1] = sub_dist
+            indices[0, r0:r1, c0:c1] = sub_idx[0] + r0
+            indices[1, r0:r1, c0:c1] = sub_idx[1] + c0
+    
+    return dist, indices
+
+
+def _bilinear_sample(data, row, col):
+    """Bilinearly sample `data` on the grid of fractional `row` x `col` indices.
+
+    The target grid is regular, so row and column weights are computed once per
+    axis and the four corners are gathered with `np.ix_`, without any
+    (ny, nx) coordinate arrays.
+    Points within half a pixel of the outermost pixel centres take the edge
+    value; points beyond the pixel-edge footprint of `data`, or touching a NaN
+    corner, come back NaN.
+    
+    Args:
+        data (np.array): Source grid (h, w).
+        row (np.array): Fractional row indices (ny,).
+        col (np.array): Fractional column indices (nx,).
+
+    Returns:
+        np.array: The sampled grid (ny, nx).
+    """
+
+    h, w = data.shape
+    dtype = data.dtype if np.issubdtype(data.dtype, np.floating) else np.float32
+    
+    outside_row = (row < -0.5) | (row > h - 0.5)
+    outside_col = (col < -0.5) | (col > w - 0.5)
+    row = np.clip(row, 0, h - 1)
+    col = np.clip(col, 0, w - 1)
+    
+    r0 = np.clip(np.floor(row), 0, max(h - 2, 0)).astype(np.intp)
+    c0 = np.clip(np.floor(col), 0, max(w - 2, 0)).astype(np.intp)
+    r1 = np.minimum(r0 + 1, h - 1)
+    c1 = np.minimum(c0 + 1, w - 1)
+    
+    wy = (row - r0).astype(dtype)[:, None]
+    wx = (col - c0).astype(dtype)[None, :]
+
+    out = data[np.ix_(r0, c0)] * ((1 - wy) * (1 - wx))
+    out += data[np.ix_(r0, c1)] * ((1 - wy) * wx)
+    out += data[np.ix_(r1, c0)] * (wy * (1 - wx))
+    out += data[np.ix_(r1, c1)] * (wy * wx)
+
+    out[outside_row, :] = np.nan
+    out[:, outside_col] = np.nan
+    
+    return out
+
+
 def plot_grid(grid_array, region, title="Vertical Shift Preview"):
     """Plot the transformation grid using Matplotlib.
     
@@ -35,10 +136,16 @@ def plot_grid(grid_array, region, title="Vertical Shift Preview"):
         logger.warning("Matplotlib is not installed. Cannot generate preview.")
         return
 
-    masked_data = np.ma.masked_where(
-        (np.isnan(grid_array)) | (grid_array == -9999) | (grid_array == 0), 
-        grid_array
-    )
+    # Mask NaN, nodata and zero in one pass if numexpr is available
+    try:
+        import numexpr as ne
+        invalid = ne.evaluate('(g != g) | (g == -9999) | (g == 0)', local_dict={'g': grid_array})
+    except ImportError:
+        invalid = np.isnan(grid_array)
+        invalid |= (grid_array == -9999)
+        invalid |= (grid_array == 0)
+        
+    masked_data = np.ma.masked_where(invalid, grid_array)
 
     if masked_data.count() == 0:
         logger.warning("Preview skipped: Grid contains no valid data.")
@@ -69,6 +176,12 @@ def plot_grid(grid_array, region, title="Vertical Shift Preview"):
 
     
 class GridEngine:
+    # Target grid tile size for the mosaic loop; a float32 tile is 1 MB
+    TILE_SIZE = 512
+
+    # Mosaics with more sources than this go through the GDAL warper
+    WARP_MIN_SOURCES = 4
+    
     @staticmethod
     def load_and_interpolate(source_files, target_region, nx, ny):
         """Mosaic/Resample raster inputs onto the target grid.
@@ -81,66 +194,186 @@ class GridEngine:
         Returns:
             np.array: The composited grid (ny, nx).
         """
+
+        if len(source_files) > GridEngine.WARP_MIN_SOURCES:
+            return GridEngine.load_and_interpolate_warp(source_files, target_region, nx, ny)
         
         # Create Target Grid Coordinates (Pixel Centers)
-        tx = np.linspace(target_region[0], target_region[1], nx)
-        ty = np.linspace(target_region[2], target_region[3], ny)
+        tx = utils.axis_nodes(target_region[0], target_region[1], nx)
+        ty = utils.axis_nodes(target_region[2], target_region[3], ny)
         
         mosaic = np.full((ny, nx), np.nan, dtype=np.float32)
+
+        # Rasterio and numpy release the GIL for I/O and array math, so threads
+        # are enough here and avoid pickling grids across processes.
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            # Read the sources concurrently (map keeps the input order)
+            sources = [
+                source for source in executor.map(
+                    lambda src_fn: GridEngine._prepare_source(src_fn, target_region), source_files
+                ) if source is not None
+            ]
+
+            if not sources:
+                return mosaic
+
+            # --- MOSAIC (Tiled) ---
+            # Work through the target in tiles so the mosaic tile and the patches
+            # stay cache-resident while every source contributes to it.
+            # Tiles are disjoint views of the mosaic, so they can be filled concurrently.
+            ts = GridEngine.TILE_SIZE
+            futures = [
+                executor.submit(
+                    GridEngine._mosaic_tile,
+                    mosaic[i0:i0 + ts, j0:j0 + ts], sources, tx[j0:j0 + ts], ty[i0:i0 + ts]
+                )
+                for i0 in range(0, ny, ts) for j0 in range(0, nx, ts)
+            ]
+            for future in futures:
+                future.result()
+                
+        return mosaic
+
+    
+    @staticmethod
+    def load_and_interpolate_warp(source_files, target_region, nx, ny):
+        """Mosaic/Resample raster inputs onto the target grid with the GDAL warper.
+
+        Same inputs, outputs and source precedence as `load_and_interpolate`,
+        but each source is resampled by `rasterio.warp.reproject` (bilinear,
+        multithreaded, in C). Better suited to large mosaics.
+        """
         
-        # Grid for interpolation queries
-        tv, tu = np.meshgrid(ty, tx, indexing='ij')
-        query_pts = np.array([tv.ravel(), tu.ravel()]).T
+        tx = utils.axis_nodes(target_region[0], target_region[1], nx)
+        ty = utils.axis_nodes(target_region[2], target_region[3], ny)
+        dtx = tx[1] - tx[0] if nx > 1 else 1
+        dty = ty[1] - ty[0] if ny > 1 else 1
 
-        for src_fn in source_files:
+        # The warper wants north-up, so warp into a north-up buffer;
+        # the mosaic rows run south -> north, so view it upside down.
+        dst_transform = Affine(dtx, 0, tx[0] - dtx / 2, 0, -dty, ty[-1] + dty / 2)
+        
+        mosaic = np.full((ny, nx), np.nan, dtype=np.float32)
+        mosaic_north_up = mosaic[::-1]
+        patch = np.empty((ny, nx), dtype=np.float32)
+        fill = np.empty((ny, nx), dtype=bool)
+        
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            sources = [
+                source for source in executor.map(
+                    lambda src_fn: GridEngine._prepare_source(src_fn, target_region), source_files
+                ) if source is not None
+            ]
+
+        for src_fn, lons, lats, data in sources:
+            if len(lons) < 2 or len(lats) < 2:
+                logger.debug(f"Skipping {os.path.basename(src_fn)}: Too small to warp.")
+                continue
+            
             try:
-                if not os.path.exists(src_fn): continue
-
-                #lons, lats, data = GridEngine._read_raster(src_fn, target_region)
-                lons, lats, data = GridEngine._read_raster(src_fn)#, target_region)
-                if data is None: continue
-                # Fill internal NaNs to prevent holes during interpolation
-                if np.isnan(data).any():
-                    data = GridEngine.fill_nans(data, decay_pixels=100)
-
-                # --- OVERLAP CHECK ---
-                # Skip if file is totally outside region
-                if (lons.min() > target_region[1] or lons.max() < target_region[0] or
-                    lats.min() > target_region[3] or lats.max() < target_region[2]):
-                    logger.debug(f"Skipping {os.path.basename(src_fn)}: Outside target bounds.")
-                    continue
-
-                # --- STANDARDIZE FOR SCIPY ---
-                # RegularGridInterpolator requires strictly increasing axes.
-                if lons[0] > lons[-1]:
-                    lons = np.flip(lons)
-                    data = np.flip(data, axis=1)
+                # lons/lats are pixel centers
+                dx = lons[1] - lons[0]
+                dy = lats[1] - lats[0]
+                src_transform = Affine(dx, 0, lons[0] - dx / 2, 0, dy, lats[0] - dy / 2)
+
+                patch.fill(np.nan)
+                rasterio.warp.reproject(
+                    source=np.asarray(data, dtype=np.float32),
+                    destination=patch,
+                    src_transform=src_transform,
+                    src_crs='EPSG:4326',
+                    src_nodata=np.nan,
+                    dst_transform=dst_transform,
+                    dst_crs='EPSG:4326',
+                    dst_nodata=np.nan,
+                    resampling=rasterio.warp.Resampling.bilinear,
+                    num_threads=os.cpu_count(),
+                )
+
+                # Overwrite existing NaNs with valid data from this patch
+                np.isnan(patch, out=fill)
+                np.logical_not(fill, out=fill)
+                fill &= np.isnan(mosaic_north_up)
+                np.copyto(mosaic_north_up, patch, where=fill)
                 
-                if lats[0] > lats[-1]:
-                    lats = np.flip(lats)
-                    data = np.flip(data, axis=0)
+            except Exception as e:
+                logger.error(f"Error processing {src_fn}: {e}")
+                
+        return mosaic
+
+    
+    @staticmethod
+    def _prepare_source(src_fn, target_region):
+        """Read and NaN-fill one source grid for mosaicking.
+
+        Returns:
+            tuple: (src_fn, lons, lats, data), or None.
+        """
+        
+        try:
+            if not os.path.exists(src_fn): return None
+
+            lons, lats, data = GridEngine._read_raster(src_fn, target_region)
+            if data is None:
+                logger.debug(f"Skipping {os.path.basename(src_fn)}: Outside target bounds.")
+                return None
+
+            # Fill internal NaNs to prevent holes during interpolation
+            if np.isnan(data).any():
+                data = GridEngine.fill_nans(data, decay_pixels=100)
+
+            # --- OVERLAP CHECK ---
+            # Skip if file is totally outside region
+            if (lons.min() > target_region[1] or lons.max() < target_region[0] or
+                lats.min() > target_region[3] or lats.max() < target_region[2]):
+                logger.debug(f"Skipping {os.path.basename(src_fn)}: Outside target bounds.")
+                return None
+
+            # Descending axes (e.g. north-up rows) are left as they are;
+            # the index math in _mosaic_tile handles either direction.
+            return src_fn, lons, lats, data
+        
+        except Exception as e:
+            logger.error(f"Error processing {src_fn}: {e}")
+            return None
 
+        
+    @staticmethod
+    def _mosaic_tile(mosaic_tile, sources, tx, ty):
+        """Fill the NaNs of one mosaic tile (in place) from the sources, in order."""
+
+        # Mask buffers, reused for every source
+        fill = np.empty(mosaic_tile.shape, dtype=bool)
+        empty = np.empty(mosaic_tile.shape, dtype=bool)
+        
+        for src_fn, lons, lats, data in sources:
+            # Skip sources whose pixel-edge footprint doesn't reach this tile
+            hx = abs(lons[1] - lons[0]) / 2 if len(lons) > 1 else 0
+            hy = abs(lats[1] - lats[0]) / 2 if len(lats) > 1 else 0
+            if (min(lons[0], lons[-1]) - hx > tx[-1] or max(lons[0], lons[-1]) + hx < tx[0] or
+                min(lats[0], lats[-1]) - hy > ty[-1] or max(lats[0], lats[-1]) + hy < ty[0]):
+                continue
+
+            try:
                 # --- INTERPOLATE ---
-                # (y_coords, x_coords), data_array
-                interp = RegularGridInterpolator(
-                    (lats, lons), 
-                    data, 
-                    bounds_error=False, 
-                    fill_value=None,
-                    method='linear',
-                )
+                # The source axes are regular, so target coordinates map to
+                # fractional (row, col) indices with an affine transform.
+                # A negative step (descending axis) maps correctly as well.
+                row = (ty - lats[0]) / (lats[1] - lats[0] if len(lats) > 1 else 1)
+                col = (tx - lons[0]) / (lons[1] - lons[0] if len(lons) > 1 else 1)
+
+                # Bilinear; points beyond the source's pixel edges become NaN
+                patch = _bilinear_sample(data, row, col).astype(np.float32, copy=False)
                 
-                # Interpolate onto target grid
-                patch = interp(query_pts).reshape(ny, nx)
                 # --- MOSAIC (Fill NaNs) ---
                 # Overwrite existing NaNs with valid data from this patch
-                mask = np.isnan(mosaic) & ~np.isnan(patch)
-                mosaic[mask] = patch[mask]
+                np.isnan(patch, out=fill)
+                np.logical_not(fill, out=fill)
+                fill &= np.isnan(mosaic_tile, out=empty)
+                np.copyto(mosaic_tile, patch, where=fill)
                 
             except Exception as e:
                 logger.error(f"Error processing {src_fn}: {e}")
-                
-        return mosaic
 
     
     @staticmethod
@@ -152,39 +385,61 @@ class GridEngine:
         if mask.all(): return data 
 
         # Distance transform to nearest valid pixel
-        dist, indices = ndimage.distance_transform_edt(
-            mask, 
-            return_distances=True, 
-            return_indices=True
-        )
+        dist, indices = _bounded_edt(mask, decay_pixels)
         
-        # Get value at nearest valid pixel
-        coast_values = data[tuple(indices)]
+        # Only the NaN pixels need filling
+        rows, cols = np.nonzero(mask)
         
-        # Decay factor (1.0 at edge -> 0.0 at decay_pixels distance)
-        decay_factor = np.clip((decay_pixels - dist) / decay_pixels, 0, 1)
+        # Value at nearest valid pixel
+        coast_values = data[indices[0, rows, cols], indices[1, rows, cols]]
         
-        filled_values = coast_values * decay_factor
+        # Decay factor (1.0 at edge -> 0.0 at decay_pixels distance)
+        decay_factor = np.clip((decay_pixels - dist[rows, cols].astype(np.float32)) / decay_pixels, 0, 1)
         
         out_data = data.copy()        
-        out_data[mask] = filled_values[mask]
+        out_data[rows, cols] = coast_values * decay_factor
         
         return out_data
 
     
     @staticmethod
-    def _read_raster(filename):
+    def _read_raster(filename, region=None, pad=100):
         """Unified Raster Reader using Rasterio.
 
         For .tif and .gtx files.
+
+        If `region` is given, only the part of the raster intersecting it
+        (plus `pad` pixels on each side, so NaN filling and interpolation
+        still see their neighbours) is read. Returns (None, None, None) if
+        the raster does not intersect `region`.
         """
         
         try:
             with rasterio.open(filename) as src:
-                data = src.read(1)
+                window = None
+                if region is not None:
+                    xmin, xmax, ymin, ymax = region[0], region[1], region[2], region[3]
+                    # 0-360 grids: move a western-hemisphere region into range
+                    if src.bounds.right > 180 and xmax < 0:
+                        xmin, xmax = xmin + 360, xmax + 360
+                        
+                    win = rasterio.windows.from_bounds(xmin, ymin, xmax, ymax, transform=src.transform)
+                    col_off = max(0, int(np.floor(win.col_off)) - pad)
+                    row_off = max(0, int(np.floor(win.row_off)) - pad)
+                    col_end = min(src.width, int(np.ceil(win.col_off + win.width)) + pad)
+                    row_end = min(src.height, int(np.ceil(win.row_off + win.height)) + pad)
+                    if col_end <= col_off or row_end <= row_off:
+                        return None, None, None
+                    
+                    window = rasterio.windows.Window(col_off, row_off, col_end - col_off, row_end - row_off)
+                    
+                data = src.read(1, window=window)
 
                 height, width = data.shape
-                bounds = src.bounds # left, bottom, right, top
+                if window is None:
+                    left, bottom, right, top = src.bounds
+                else:
+                    left, bottom, right, top = rasterio.windows.bounds(window, src.transform)
                 
                 if src.nodata is not None:
                     data[data == src.nodata] = np.nan
@@ -193,11 +448,11 @@ class GridEngine:
                     data[data == -88.8888] = np.nan
                     #data = data.reshape((height, width))
 
-                res_x = (bounds.right - bounds.left) / width
-                res_y = (bounds.top - bounds.bottom) / height
+                res_x = (right - left) / width
+                res_y = (top - bottom) / height
                 
-                lons = np.linspace(bounds.left + res_x/2, bounds.right - res_x/2, width)
-                lats = np.linspace(bounds.top - res_y/2, bounds.bottom + res_y/2, height)
+                lons = utils.axis_centers(left, res_x, width)
+                lats = utils.axis_centers(top, -res_y, height)
                 
                 # Longitude Normalization (0-360 -> -180-180)
                 # If grid uses 0-360 but data is -180-180, we wrap it.
@@ -224,34 +479,49 @@ class GridEngine:
         try:
             with rasterio.open(src_dem) as src:
                 profile = src.profile.copy()
-                data = src.read(1)
                 
                 # Check dimensions
-                if data.shape != shift_array.shape:
-                    raise ValueError(f"Dimension mismatch: DEM {data.shape} vs Shift {shift_array.shape}")
+                if (src.height, src.width) != shift_array.shape:
+                    raise ValueError(f"Dimension mismatch: DEM {(src.height, src.width)} vs Shift {shift_array.shape}")
                 
                 # Handle NoData
                 nodata = src.nodata
                 if nodata is None:
                     nodata = -9999
                     profile.update(nodata=nodata)
+
+                # Process in 256x256 tiles so memory use doesn't grow with the DEM
+                if profile.get('driver') == 'GTiff':
+                    profile.update(tiled=True, blockxsize=256, blockysize=256)
+
+                # Integer DEMs would truncate the shift, so write those as float32
+                if not np.issubdtype(np.dtype(profile['dtype']), np.floating):
+                    profile.update(dtype='float32')
+                    
+                out_dtype = np.dtype(profile['dtype'])
+                shift_array = shift_array.astype(out_dtype, copy=False)
                 
-                # Create validity mask
-                # If existing data is valid AND shift is valid
-                valid_mask = (data != nodata) & (~np.isnan(shift_array))
-                
-                # Apply Shift: Output = Input + Shift
-                # Transformez convention: Shift is "Input -> Output"
-                data[valid_mask] += shift_array[valid_mask]
-                
-                # Ensure invalid shift areas don't corrupt valid data?
-                # Or should they become nodata? 
-                # Decision: If shift is missing (NaN), result is undefined -> NoData
-                data[~valid_mask] = nodata
-                
-                # Write Output
                 with rasterio.open(dst_dem, 'w', **profile) as dst:
-                    dst.write(data, 1)
+                    for _, window in dst.block_windows(1):
+                        data = src.read(1, window=window, out_dtype=out_dtype)
+                        shift = shift_array[window.row_off:window.row_off + window.height,
+                                            window.col_off:window.col_off + window.width]
+                        
+                        # Invalid where the DEM is nodata OR the shift is missing
+                        invalid = np.isnan(shift)
+                        invalid |= (data == nodata)
+
+                        # Apply Shift: Output = Input + Shift
+                        # Transformez convention: Shift is "Input -> Output"
+                        # (invalid cells are overwritten below, so add everywhere)
+                        data += shift
+
+                        # Ensure invalid shift areas don't corrupt valid data?
+                        # Or should they become nodata? 
+                        # Decision: If shift is missing (NaN), result is undefined -> NoData
+                        np.copyto(data, nodata, where=invalid)
+                        
+                        dst.write(data, 1, window=window)
                     
             logger.info(f"Successfully wrote transformed DEM to: {dst_dem}")
             return True
@@ -290,9 +560,17 @@ class GridWriter:
             dtype='float32',
             crs='EPSG:4326',  # VDatum grids are WGS84
             transform=transform,
-            compress='deflate',
-            tiled=True
+            # LZW + floating point predictor writes fast and is readable by any
+            # libtiff/PROJ build (ZSTD support depends on how libtiff was built).
+            compress='lzw',
+            predictor=3,
+            num_threads='ALL_CPUS',
+            BIGTIFF='IF_SAFER',
+            tiled=True,
+            blockxsize=256,
+            blockysize=256
         ) as dst:
-            dst.write(data.astype('float32'), 1)
+            # Only copy if the grid isn't already contiguous float32
+            dst.write(np.ascontiguousarray(data, dtype=np.float32), 1)
             
         return filename
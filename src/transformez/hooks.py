@@ -16,9 +16,9 @@ import logging
 
 from fetchez.hooks import FetchHook
 from fetchez import utils
-from fetchez import spatial
 
 from .transform import VerticalTransform
+from .utils import parse_increment
 
 logger = logging.getLogger(__name__)
 
@@ -110,7 +110,10 @@ class TransformezHook(FetchHook):
     def _generate_grid(self, region):
         """Core logic to call VerticalTransform."""
 
-        nx, ny = spatial.region_and_inc_to_width_height(region, self.increment)
+        # Same increment units as `transformez -E`
+        inc_x, inc_y = parse_increment(str(self.increment))
+        nx = int(abs(region[1] - region[0]) / inc_x)
+        ny = int(abs(region[3] - region[2]) / inc_y)
 
         vt = VerticalTransform(
             extent=region,
@@ -11,9 +11,11 @@ This wraps the NGS 'htdp' tool.
 :license: MIT, see LICENSE for more details.
 """
 
+import re
 import sys
+import functools
 import subprocess
-from typing import Optional, Tuple, List
+from typing import Tuple, List
 import numpy as np
 
 import logging
@@ -28,6 +30,14 @@ ae = '.exe' if sys.platform == 'win32' else ''
 htdp_cmd = 'echo 0 | htdp 2>&1' if sys.platform == 'win32' else "echo 0 | htdp 2>&1 | grep SOFTWARE | awk '{print $3}'"
 HAS_HTDP = utils.cmd_check(f'htdp{ae}', htdp_cmd)#.decode()
 
+# An HTDP output point: [*] lat lon eht ... "PNT_x_y"
+# (HTDP sometimes puts a * warning at the start, and the name may stick to the height)
+_PNT_RE = re.compile(
+    r'^[ \t]*\*?[ \t]*([-+]?\d*\.?\d+)[ \t]+([-+]?\d*\.?\d+)[ \t]+([-+]?\d*\.?\d+)'
+    r'(?=[\s"])[^\n]*?PNT_(\d+)_(\d+)',
+    re.MULTILINE
+)
+
 # =============================================================================
 # wrapper and functions for using the htdp program
 # https://geodesy.noaa.gov/TOOLS/Htdp/Htdp.shtml
@@ -66,6 +76,37 @@ HAS_HTDP = utils.cmd_check(f'htdp{ae}', htdp_cmd)#.decode()
 # 16...ITRF93                      23...ITRF2014 or IGS14/IGb14
 # 17...ITRF94 (=ITRF96=ITRF97)
 # =============================================================================
+@functools.lru_cache(maxsize=8)
+def _create_grid(griddef: Tuple[float, ...]) -> Tuple[np.ndarray, np.ndarray]:
+    """Build (and cache) the HTDP lon/lat meshgrid for a griddef tuple."""
+    
+    # FIX: Removed the "-1 *" inversion. Use coordinates exactly as provided.
+    lon_start = griddef[0]  # West
+    lat_start = griddef[1]  # South
+    lon_end = griddef[2]    # East
+    lat_end = griddef[3]    # North
+
+    lon_steps = int(griddef[4])
+    lat_steps = int(griddef[5])
+
+    # Generate axes
+    # Ensure we always scan Min -> Max (West->East, South->North)
+    # This prevents "inverted" grids if the input bounds were swapped
+    l_min, l_max = sorted([lon_start, lon_end])
+    t_min, t_max = sorted([lat_start, lat_end])
+
+    lon_axis = utils.axis_nodes(l_min, l_max, lon_steps)
+    lat_axis = utils.axis_nodes(t_min, t_max, lat_steps)
+
+    # Broadcast views, equivalent to np.meshgrid(..., indexing='xy'):
+    # xv (lon) has shape (lat_steps, lon_steps)
+    # yv (lat) has shape (lat_steps, lon_steps)
+    xv = np.broadcast_to(lon_axis, (lat_steps, lon_steps))
+    yv = np.broadcast_to(lat_axis[:, None], (lat_steps, lon_steps))
+
+    return xv, yv
+
+
 class HTDP:
     """Wrapper for the NGS HTDP (Horizontal Time-Dependent Positioning) software."""
 
@@ -80,46 +121,6 @@ class HTDP:
             )
 
 
-    def _next_point(self, fd) -> Optional[Tuple[int, int, float, float, float]]:
-        """Parse the next point from the HTDP output file object."""
-        
-        while True:
-            line = fd.readline()
-            if not line:
-                return None
-            
-            line = line.strip()
-            # Look for lines containing the point ID tag "PNT_"
-            if 'PNT_' in line:
-                try:
-                    # Robust parsing: Replace double quotes to handle "PNT_..." sticking to numbers
-                    clean_line = line.replace('"', ' "') 
-                    parts = clean_line.split()
-                    
-                    # We expect: Lat, Lon, Height, "PNT_x_y"
-                    # Sometimes HTDP puts a * warning at the start
-                    if parts[0] == '*': 
-                        parts = parts[1:]
-
-                    lat_dst = float(parts[0])
-                    lon_dst = float(parts[1])
-                    eht_dst = float(parts[2])
-                    
-                    # Find the part that contains PNT_
-                    name_tag = next(p for p in parts if 'PNT_' in p).strip('"')
-                    
-                    # Parse indices from name "PNT_X_Y"
-                    name_tokens = name_tag.split('_')
-                    x_idx = int(name_tokens[1])
-                    y_idx = int(name_tokens[2])
-
-                    return x_idx, y_idx, lat_dst, lon_dst, eht_dst
-                except (ValueError, IndexError) as e:
-                    # Log failing lines to help debug "Points found" mismatches
-                    logging.debug(f"Failed to parse HTDP line: {line} -> {e}")
-                    continue
-                
-
     def _read_grid(self, filename: str, shape: Tuple[int, int]) -> np.ndarray:
         """Read the output grid created by HTDP.
         
@@ -133,24 +134,30 @@ class HTDP:
         points_found = 0
 
         with open(filename, 'r') as fd:
-            if self.verbose:
-                # Echo header info (approx first 5 lines)
-                for _ in range(5):
-                    header_line = fd.readline().strip()
-                    if header_line:
-                        logger.info(header_line)
-
-            ptuple = self._next_point(fd)
-            while ptuple is not None:
-                # ptuple: (x_idx, y_idx, lat, lon, height)
-                # grid indices: [row/y, col/x]
-                try:
-                    grid[ptuple[1], ptuple[0]] = ptuple[4]
-                    points_found += 1
-                except IndexError:
-                    logger.error(f'Grid index out of bounds: {ptuple}')
+            text = fd.read()
+            
+        if self.verbose:
+            # Echo header info (approx first 5 lines)
+            for header_line in text.split('\n', 5)[:5]:
+                if header_line.strip():
+                    logger.info(header_line.strip())
+
+        # Parse every point in one pass: (lat, lon, height, x_idx, y_idx)
+        matches = _PNT_RE.findall(text)
+        if matches:
+            points = np.array(matches)
+            heights = points[:, 2].astype(float)
+            x_idx = points[:, 3].astype(np.intp)
+            y_idx = points[:, 4].astype(np.intp)
+
+            # grid indices: [row/y, col/x]
+            in_bounds = (x_idx < shape[1]) & (y_idx < shape[0])
+            if not in_bounds.all():
+                logger.error(f'Grid index out of bounds: {np.count_nonzero(~in_bounds)} points')
                 
-                ptuple = self._next_point(fd)
+            x_idx, y_idx, heights = x_idx[in_bounds], y_idx[in_bounds], heights[in_bounds]
+            grid.flat[y_idx * shape[1] + x_idx] = heights
+            points_found = x_idx.size
 
         if points_found < expected_points:
             logger.error(
@@ -161,65 +168,48 @@ class HTDP:
         return grid
 
 
-    def _new_create_grid(self, griddef: List[float]) -> np.ndarray:
+    def _new_create_grid(self, griddef: List[float]) -> Tuple[np.ndarray, np.ndarray]:
         """Create a regular meshgrid of lat/long values.
         
         Args:
             griddef: [lon_min, lat_min, lon_max, lat_max, lon_steps, lat_steps]
                      Expected input is standard signed decimal degrees (West is Negative).
+
+        Returns:
+            (lon_grid, lat_grid), each (lat_steps, lon_steps). These are cached,
+            read-only broadcast views; copy them before modifying.
         """
         
-        # FIX: Removed the "-1 *" inversion. Use coordinates exactly as provided.
-        lon_start = griddef[0]  # West
-        lat_start = griddef[1]  # South
-        lon_end = griddef[2]    # East
-        lat_end = griddef[3]    # North
-
-        lon_steps = int(griddef[4])
-        lat_steps = int(griddef[5])
-
-        # Generate axes
-        # Ensure we always scan Min -> Max (West->East, South->North)
-        # This prevents "inverted" grids if the input bounds were swapped
-        l_min, l_max = sorted([lon_start, lon_end])
-        t_min, t_max = sorted([lat_start, lat_end])
-
-        lon_axis = np.linspace(l_min, l_max, lon_steps)
-        lat_axis = np.linspace(t_min, t_max, lat_steps)
-
-        # indexing='xy' ensures:
-        # xv (lon) has shape (lat_steps, lon_steps)
-        # yv (lat) has shape (lat_steps, lon_steps)
-        xv, yv = np.meshgrid(lon_axis, lat_axis, indexing='xy')
-
-        # Return stacked array: [lon_grid, lat_grid]
-        return np.array([xv, yv])
+        return _create_grid(tuple(float(g) for g in griddef))
     
 
     def _write_grid(self, grid: np.ndarray, out_filename: str):
         """Write a grid to a file suitable for HTDP input.
         
         Args:
-            grid: Numpy array of shape (2, rows, cols) where grid[0] is lon, grid[1] is lat.
+            grid: (lon_grid, lat_grid) or an array of shape (2, rows, cols) where
+                  grid[0] is lon, grid[1] is lat.
             out_filename: Output file path.
         """
         
-        # grid shape: (2, rows, cols)
-        rows = grid.shape[1]
-        cols = grid.shape[2]
-
-        with open(out_filename, 'w') as fd_out:
-            for i in range(cols):
-                for j in range(rows):
-                    # FIX: Use f-string formatting {:.9f} to prevent scientific notation (1e-5)
-                    # and ensure strict space separation.
-                    lat = grid[1, j, i]
-                    lon = grid[0, j, i]
-                    
-                    # Note: HTDP allows free format but prefers spaces.
-                    fd_out.write(
-                        f'{lat:.9f} {lon:.9f} 0.000 "PNT_{i}_{j}"\n'
-                    )
+        # grid[0] shape: (rows, cols)
+        rows, cols = grid[0].shape
+
+        # Points are written column-major (for i in cols: for j in rows),
+        # so transpose before flattening.
+        lat = grid[1].T.ravel()
+        lon = grid[0].T.ravel()
+        col_idx = np.repeat(np.arange(cols), rows)
+        row_idx = np.tile(np.arange(rows), cols)
+        
+        # FIX: Use %.9f formatting to prevent scientific notation (1e-5)
+        # and ensure strict space separation.
+        # Note: HTDP allows free format but prefers spaces.
+        np.savetxt(
+            out_filename,
+            np.column_stack([lat, lon, col_idx, row_idx]),
+            fmt='%.9f %.9f 0.000 "PNT_%d_%d"'
+        )
                     
                     
     def _write_control(self, control_fn: str, out_grid_fn: str,
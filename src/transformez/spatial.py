@@ -13,6 +13,7 @@ srs aware Region from fetchez
 
 import logging
 import warnings
+import functools
 from typing import Union, List
 
 import numpy as np
@@ -20,10 +21,13 @@ from fetchez.utils import str_or
 from fetchez.spatial import *
 from . import srs
 
-import pyproj
-
 logger = logging.getLogger(__name__)
 
+# pyproj warns that the proj4 strings used for the warp pipeline are lossy;
+# filter that one message once here instead of muting every warning around
+# each `warp` call.
+warnings.filterwarnings('ignore', message='You will likely lose important projection information', category=UserWarning)
+
 class TransRegion(Region):
 
     # gtl is (geo-transform, xcount, ycount)
@@ -43,36 +47,12 @@ class TransRegion(Region):
 
     def srcwin(self, geo_transform, x_count, y_count, node='grid'):
         """Output the appropriate GDAL srcwin (xoff, yoff, xsize, ysize)."""
-        
-        # Get raw pixel coordinates for the Region corners
-        # We calculate UL (xmin, ymax) and LR (xmax, ymin) without clamping yet
-        ul = _geo2pixel(self.xmin, self.ymax, geo_transform, node=node)
-        lr = _geo2pixel(self.xmax, self.ymin, geo_transform, node=node)
-        
-        # Sort to find min/max (Handles South-Up images or axis flips)
-        # x_indices[0] is the Left-most pixel, x_indices[1] is Right-most
-        x_indices = sorted([ul[0], lr[0]])
-        y_indices = sorted([ul[1], lr[1]])
-        
-        # Calculate Intersection with Raster Dimensions [0, count]
-        # We clamp the START to 0, and the END to x_count
-        x_start = max(0, x_indices[0])
-        x_stop = min(x_count, x_indices[1] + 1) # +1 to include the last pixel (Fencepost fix)
-        
-        y_start = max(0, y_indices[0])
-        y_stop = min(y_count, y_indices[1] + 1) # +1 to include the last pixel
-        
-        # Calculate Size
-        x_size = x_stop - x_start
-        y_size = y_stop - y_start
-        
-        # Handle Valid but Empty Intersection (e.g. region is outside raster)
-        if x_size <= 0 or y_size <= 0:
-             return 0, 0, 0, 0
-             
-        return int(x_start), int(y_start), int(x_size), int(y_size)
+
+        xoff, yoff, xsize, ysize = srcwin_batch([self], geo_transform, x_count, y_count, node=node)[0].tolist()
+        return xoff, yoff, xsize, ysize
     
     
+
     def geo_transform(self, x_inc: float = 0, y_inc: float = None, node: str = 'grid'):
         """Return dimensions and a geotransform based on the region and a cellsize.
 
@@ -124,26 +104,31 @@ class TransRegion(Region):
             density (int): Number of points per edge.
 
         Returns:
-            list: A list of (x, y) tuples representing the densified perimeter.
+            tuple: (xs, ys) arrays of the densified perimeter, 4 * density points each.
         """
 
         if not self.valid_p():
             return []
 
-        xs = []
-        ys = []
+        xs = np.empty(4 * density, dtype=np.float64)
+        ys = np.empty(4 * density, dtype=np.float64)
+        west, north, east, south = (slice(i * density, (i + 1) * density) for i in range(4))
 
-        ys.extend(np.linspace(self.ymin, self.ymax, density))
-        xs.extend([self.xmin] * density)
+        # West edge, south -> north
+        ys[west] = np.linspace(self.ymin, self.ymax, density)
+        xs[west] = self.xmin
 
-        xs.extend(np.linspace(self.xmin, self.xmax, density))
-        ys.extend([self.ymax] * density)
+        # North edge, west -> east
+        xs[north] = np.linspace(self.xmin, self.xmax, density)
+        ys[north] = self.ymax
 
-        ys.extend(np.linspace(self.ymax, self.ymin, density))
-        xs.extend([self.xmax] * density)
+        # East edge, north -> south
+        ys[east] = np.linspace(self.ymax, self.ymin, density)
+        xs[east] = self.xmax
 
-        xs.extend(np.linspace(self.xmax, self.xmin, density))
-        ys.extend([self.ymin] * density)
+        # South edge, east -> west
+        xs[south] = np.linspace(self.xmax, self.xmin, density)
+        ys[south] = self.ymin
 
         #return list(zip(xs, ys))
         return xs, ys
@@ -154,13 +139,19 @@ class TransRegion(Region):
             logger.error(f'Could not perform region transformation; {self}')
             return self
         
+        # Transform all edge points in one batched call
         points_x, points_y = self.densify_edges(20)
-        trans_points_x, trans_points_y = transformer.transform(points_x, points_y, direction=transform_direction)
-
-        self.xmin = min(trans_points_x)
-        self.xmax = max(trans_points_x)
-        self.ymin = min(trans_points_y)
-        self.ymax = max(trans_points_y)
+        trans_points_x, trans_points_y = transformer.transform(
+            np.asarray(points_x, dtype=np.float64),
+            np.asarray(points_y, dtype=np.float64),
+            direction=transform_direction,
+            errcheck=False
+        )
+
+        self.xmin = float(np.min(trans_points_x))
+        self.xmax = float(np.max(trans_points_x))
+        self.ymin = float(np.min(trans_points_y))
+        self.ymax = float(np.max(trans_points_y))
         
         # set the new SRS
         #self.src_srs = d_srs.ExportToWkt()
@@ -186,37 +177,132 @@ class TransRegion(Region):
             logger.warning(f'Region has no valid associated srs: {self.srs}')
             return self
 
-        with warnings.catch_warnings():
-            warnings.simplefilter('ignore')
-            transform = srs.SRSParser(src_srs=self.srs, dst_srs=dst_srs)
+        transform = srs.SRSParser(src_srs=self.srs, dst_srs=dst_srs)
 
-            if transform.tc['src_horz_crs'] and transform.tc['dst_horz_crs']:        
-                pipeline_str = '+proj=pipeline +step {} +inv +step {}'.format(
-                    transform.tc['src_horz_crs'].to_proj4(), 
-                    transform.tc['dst_horz_crs'].to_proj4()
-                )
-                transformer = pyproj.Transformer.from_pipeline(pipeline_str)
-
-                self.src_srs = dst_srs
-                self.wkt = None
-                return self.transform_densify(transformer)
+        # SRSParser flattens compound CRS to their horizontal component
+        src_crs = transform.tc['src_crs']
+        dst_crs = transform.tc['dst_crs']
+        if src_crs and dst_crs:
+            self.src_srs = dst_srs
+            self.wkt = None
+            
+            # Same horizontal CRS (e.g. only the vertical differs), nothing to warp
+            if src_crs.equals(dst_crs):
+                return self
+            
+            transformer = srs._pipeline_transformer(src_crs.to_wkt(), dst_crs.to_wkt())
+            return self.transform_densify(transformer)
 
         return self
     
 
+def srcwin_batch(regions, geo_transform, x_count, y_count, node='grid'):
+    """Vectorized `TransRegion.srcwin`: GDAL srcwins for many regions against one raster.
+
+    Args:
+        regions: Region objects, or an (N, 4) array-like of (xmin, xmax, ymin, ymax).
+
+    Returns:
+        np.ndarray: (N, 4) int64 array of (xoff, yoff, xsize, ysize), with
+                    (0, 0, 0, 0) rows for regions that miss the raster.
+    """
+
+    if isinstance(regions, np.ndarray):
+        bounds = regions.astype(np.float64, copy=False).reshape(-1, 4)
+    else:
+        bounds = np.array(
+            [[r.xmin, r.xmax, r.ymin, r.ymax] if isinstance(r, Region) else r for r in regions],
+            dtype=np.float64
+        ).reshape(-1, 4)
+
+    # Pixel coordinates of the UL (xmin, ymax) and LR (xmax, ymin) corners
+    ul_x, ul_y = geo2pixel_batch(bounds[:, 0], bounds[:, 3], geo_transform, node=node)
+    lr_x, lr_y = geo2pixel_batch(bounds[:, 1], bounds[:, 2], geo_transform, node=node)
+
+    # min/max handles South-Up images or axis flips; clamp [start, stop + 1) to
+    # the raster dimensions (+1 to include the last pixel)
+    x_start = np.clip(np.minimum(ul_x, lr_x), 0, x_count)
+    x_stop = np.clip(np.maximum(ul_x, lr_x) + 1, 0, x_count)
+    y_start = np.clip(np.minimum(ul_y, lr_y), 0, y_count)
+    y_stop = np.clip(np.maximum(ul_y, lr_y) + 1, 0, y_count)
+
+    # Valid but empty intersection (e.g. region is outside raster)
+    srcwins = np.stack([x_start, y_start, x_stop - x_start, y_stop - y_start], axis=1)
+    srcwins[(srcwins[:, 2] <= 0) | (srcwins[:, 3] <= 0)] = 0
+    return srcwins
+
+
 def _geo2pixel(geo_x, geo_y, geo_transform, node='grid'):
     """Convert a geographic x,y value to a pixel location."""
+
+    pixel_x, pixel_y = _geo2pixel_func(tuple(geo_transform), node)(geo_x, geo_y)
+    return int(pixel_x), int(pixel_y)
+
+
+def _geo2pixel_axis_aligned(geo_x, geo_y, gt0, gt1, gt3, gt5, offset):
+    """geo -> pixel for a north-up (no rotation) geotransform."""
+    
+    return (geo_x - gt0) / gt1 + offset, (geo_y - gt3) / gt5 + offset
+
+
+def _geo2pixel_rotated(geo_x, geo_y, inv):
+    """geo -> pixel through the inverse affine matrix.
+    Same as _apply_gt(x, y, _invert_gt(gt)) with its pixel-node offset.
+    """
+
+    geo_x = geo_x + .5
+    geo_y = geo_y + .5
+    return (inv[0, 0] * geo_x + inv[0, 1] * geo_y + inv[0, 2],
+            inv[1, 0] * geo_x + inv[1, 1] * geo_y + inv[1, 2])
+
+
+@functools.lru_cache(maxsize=64)
+def _geo2pixel_func(geo_transform, node='grid'):
+    """Return a geo -> (float) pixel function specialized for this (tuple) geotransform.
+
+    The rotation check and the inverse are done once per geotransform
+    rather than on every call. Works on scalars and numpy arrays.
+    """
     
     if geo_transform[2] + geo_transform[4] == 0:
-        pixel_x = (geo_x - geo_transform[0]) / geo_transform[1]
-        pixel_y = (geo_y - geo_transform[3]) / geo_transform[5]
-        if node == 'grid':
-            pixel_x += .5
-            pixel_y += .5
-    else:
-        pixel_x, pixel_y = _apply_gt(geo_x, geo_y, _invert_gt(geo_transform))
-        
-    return int(pixel_x), int(pixel_y)
+        return functools.partial(
+            _geo2pixel_axis_aligned,
+            gt0=geo_transform[0], gt1=geo_transform[1],
+            gt3=geo_transform[3], gt5=geo_transform[5],
+            offset=.5 if node == 'grid' else 0
+        )
+    
+    return functools.partial(_geo2pixel_rotated, inv=_gt_inverse_matrix(geo_transform))
+
+
+@functools.lru_cache(maxsize=64)
+def _gt_inverse_matrix(geo_transform):
+    """The inverse of a (tuple) geotransform as a 3x3 affine matrix, or None if singular."""
+    
+    inv_gt = _invert_gt(geo_transform)
+    if inv_gt is None:
+        return None
+    
+    return np.array([
+        [inv_gt[1], inv_gt[2], inv_gt[0]],
+        [inv_gt[4], inv_gt[5], inv_gt[3]],
+        [0.0, 0.0, 1.0]
+    ])
+
+
+def geo2pixel_batch(geo_xs, geo_ys, geo_transform, node='grid'):
+    """Vectorized `_geo2pixel`: convert arrays of geographic x,y values to pixel locations.
+
+    Returns:
+        tuple: (pixel_xs, pixel_ys) as int64 arrays.
+    """
+
+    pixel_x, pixel_y = _geo2pixel_func(tuple(geo_transform), node)(
+        np.asarray(geo_xs, dtype=np.float64), np.asarray(geo_ys, dtype=np.float64)
+    )
+
+    # int() truncation, as in _geo2pixel
+    return np.trunc(pixel_x).astype(np.int64), np.trunc(pixel_y).astype(np.int64)
 
 
 def _apply_gt(in_x, in_y, geo_transform, node='pixel'):
@@ -231,28 +317,46 @@ def _apply_gt(in_x, in_y, geo_transform, node='pixel'):
 
 def _invert_gt(geo_transform):
     """Invert the geo_transform."""
+
+    return _invert_gt_cached(tuple(geo_transform))
+
+
+@functools.lru_cache(maxsize=64)
+def _invert_gt_cached(geo_transform):
+    """Invert a (tuple) geo_transform; rasters reuse one geotransform, so cache it."""
     
-    det = (geo_transform[1] * geo_transform[5]) - (geo_transform[2] * geo_transform[4])
+    gt0, gt1, gt2, gt3, gt4, gt5 = geo_transform
+    det = (gt1 * gt5) - (gt2 * gt4)
     if abs(det) < 1e-15:
         return None
     
     inv_det = 1.0 / det
-    out_gt = [0.0] * 6
-    out_gt[1] = geo_transform[5] * inv_det
-    out_gt[4] = -geo_transform[4] * inv_det
-    out_gt[2] = -geo_transform[2] * inv_det
-    out_gt[5] = geo_transform[1] * inv_det
-    out_gt[0] = (geo_transform[2] * geo_transform[3] - geo_transform[0] * geo_transform[5]) * inv_det
-    out_gt[3] = (-geo_transform[1] * geo_transform[3] + geo_transform[0] * geo_transform[4]) * inv_det
-    return out_gt
+    return (
+        (gt2 * gt3 - gt0 * gt5) * inv_det,
+        gt5 * inv_det,
+        -gt2 * inv_det,
+        (-gt1 * gt3 + gt0 * gt4) * inv_det,
+        -gt4 * inv_det,
+        gt1 * inv_det,
+    )
 
 
 def x360(x):
+    if isinstance(x, np.ndarray): return x360_array(x)
+    
     if x == 0: return -180
     elif x == 360: return 180
     else: return ((x + 180) % 360) - 180
 
 
+def x360_array(x):
+    """Branchless `x360` over an array of longitudes (keeps the 0 -> -180 and 360 -> 180 edges)."""
+
+    x = np.asarray(x, dtype=np.float64)
+    out = np.mod(x + 180.0, 360.0) - 180.0
+    return np.where(x == 0, -180.0, np.where(x == 360, 180.0, out))
+
+
 def transform_increment(dst_inc_x, dst_inc_y, transformer, region_center):
     """Transform grid increments from Destination SRS to Source SRS.
     
@@ -283,34 +387,56 @@ def transform_increment(dst_inc_x, dst_inc_y, transformer, region_center):
     return src_inc_x, src_inc_y
 
 
-def parse_region(input_r: Union[str, List]) -> List[Region]:
-    """Main function to parse region input into a list of Region objects."""
+def _parse_region_string(input_r: str) -> List[Region]:
+    """Parse a single region string (geojson file, place name or region string)."""
+
+    # Only the ends of the string matter, so don't lower() the whole thing
+    if input_r[-8:].lower().endswith(('.json', '.geojson')):
+        rs = TransRegion.from_list(region_from_geojson(input_r))
+        return list(rs) if rs else []
     
+    if input_r[:6].lower().startswith(('loc:', 'place:')):
+        r = TransRegion.from_list(region_from_place(input_r))
+    else:
+        r = TransRegion.from_string(input_r)
+        
+    return [r] if r else []
+
+
+def _parse_region_seq(input_r: Union[list, tuple]) -> List[Region]:
+    """Parse a coordinate list [w, e, s, n] or a list of region identifiers."""
+
+    # Check if it is a single Coordinate List [w, e, s, n]
+    if len(input_r) == 4 and all(isinstance(n, (int, float)) for n in input_r):
+        return [TransRegion.from_list(input_r)]
+
+    # Recursive parse for list of identifiers
     regions = []
-    
-    # 1. Single String
-    if isinstance(input_r, str):
-        s_lower = input_r.lower()
-        if s_lower.endswith(('.json', '.geojson')):
-            rs = TransRegion.from_list(region_from_geojson(input_r))
-            if rs: regions.extend(rs)
-        elif s_lower.startswith(('loc:', 'place:')):
-            r = TransRegion.from_list(region_from_place(input_r))
-            if r: regions.append(r)
-        else:
-            r = TransRegion.from_string(input_r)
-            if r: regions.append(r)
-            
-    # 2. List/Tuple (Coordinate list OR List of strings)
-    elif isinstance(input_r, (list, tuple)):
-        # Check if it is a single Coordinate List [w, e, s, n]
-        if len(input_r) == 4 and all(isinstance(n, (int, float)) for n in input_r):
-            regions.append(TransRegion.from_list(input_r))
-        else:
-            # Recursive parse for list of identifiers
-            for item in input_r:
-                regions.extend(parse_region(item))
+    for item in input_r:
+        regions.extend(parse_region(item))
+        
+    return regions
+
+
+_PARSE_REGION_DISPATCH = {
+    str: _parse_region_string,
+    list: _parse_region_seq,
+    tuple: _parse_region_seq,
+}
 
+def parse_region(input_r: Union[str, List]) -> List[Region]:
+    """Main function to parse region input into a list of Region objects."""
+
+    handler = _PARSE_REGION_DISPATCH.get(type(input_r))
+    if handler is None:
+        # subclasses of str/list/tuple
+        if isinstance(input_r, str):
+            handler = _parse_region_string
+        elif isinstance(input_r, (list, tuple)):
+            handler = _parse_region_seq
+            
+    regions = handler(input_r) if handler is not None else []
+    
     if not regions:
         # Don't warn on None input, only on failed parse of actual input
         if input_r is not None:
@@ -14,6 +14,11 @@ and a self generated vertical transformation grid.
 
 import os
 import logging
+import functools
+
+from . import _ensure_proj_lib
+_ensure_proj_lib()
+
 from pyproj import CRS, Transformer
 
 from fetchez.spatial import Region
@@ -23,6 +28,33 @@ from .grid_engine import GridWriter
 
 logger = logging.getLogger(__name__)
 
+# Transformer/CRS construction is expensive and the same SRS pairs come up
+# over and over, so cache them. Keys are strings (user input or WKT).
+@functools.lru_cache(maxsize=256)
+def _cached_crs(srs_str):
+    """CRS.from_user_input, cached on the input string."""
+    
+    return CRS.from_user_input(srs_str)
+
+
+@functools.lru_cache(maxsize=256)
+def _cached_transformer(src_wkt, dst_wkt, always_xy=True):
+    """Transformer.from_crs, cached on the source/destination WKT."""
+    
+    return Transformer.from_crs(CRS.from_wkt(src_wkt), CRS.from_wkt(dst_wkt), always_xy=always_xy)
+
+
+@functools.lru_cache(maxsize=128)
+def _pipeline_transformer(src_wkt, dst_wkt):
+    """Inverse-source / forward-destination proj pipeline Transformer, cached on the WKT pair."""
+
+    pipeline_str = '+proj=pipeline +step {} +inv +step {}'.format(
+        CRS.from_wkt(src_wkt).to_proj4(),
+        CRS.from_wkt(dst_wkt).to_proj4()
+    )
+    return Transformer.from_pipeline(pipeline_str)
+
+
 class SRSParser:
     """Parses SRS and prepares a Decoupled Transformation:
 
@@ -68,8 +100,8 @@ class SRSParser:
         clean_dst, self.tc['dst_geoid'] = self._extract_geoid(self.dst_srs_input)
 
         try:
-            self.tc['src_crs'] = CRS.from_user_input(clean_src)
-            self.tc['dst_crs'] = CRS.from_user_input(clean_dst)
+            self.tc['src_crs'] = _cached_crs(clean_src)
+            self.tc['dst_crs'] = _cached_crs(clean_dst)
         except Exception as e:
             logger.error(f"Invalid SRS: {e}")
             return
@@ -158,11 +190,11 @@ class SRSParser:
             self.set_vertical_transform()
 
         # Define Hub: NAD83(2011) 2D - maybe this should be wgs(transit)
-        hub_crs = CRS.from_epsg(4269)
+        hub_wkt = _cached_crs('EPSG:4269').to_wkt()
 
         # only build 2D transformer (for proj). We'll apply the vertical grid ourselves,
         # as pyproj seems finicky when it comes to this.
-        t_to_hub = Transformer.from_crs(self.tc['src_crs'], hub_crs, always_xy=True)
-        t_from_hub = Transformer.from_crs(hub_crs, self.tc['dst_crs'], always_xy=True)
+        t_to_hub = _cached_transformer(self.tc['src_crs'].to_wkt(), hub_wkt, always_xy=True)
+        t_from_hub = _cached_transformer(hub_wkt, self.tc['dst_crs'].to_wkt(), always_xy=True)
         
         return t_to_hub, t_from_hub, self.manual_vert_grid
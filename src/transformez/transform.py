@@ -35,6 +35,26 @@ def region_geo_transform(region, nx: int, ny: int):
     return (min_x, x_res, 0, max_y, 0, -y_res)
 
 
+def _accumulate(total, grid, sign=1):
+    """Add (sign > 0) or subtract (sign < 0) `grid` into `total` in place.
+    None stands in for a zero shift, so nothing is allocated until there
+    is a real grid to add. `grid` itself is never modified.
+    """
+
+    if grid is None:
+        return total
+    
+    if total is None:
+        return grid.copy() if sign > 0 else np.negative(grid)
+
+    if sign > 0:
+        np.add(total, grid, out=total)
+    else:
+        np.subtract(total, grid, out=total)
+        
+    return total
+
+
 class VerticalTransform:
     """Generate a vertical transformation grid using Transformez definitions and fetchez."""
     
@@ -64,6 +84,9 @@ class VerticalTransform:
         self.ref_in = Datums.get_frame_type(self.epsg_in)
         self.ref_out = Datums.get_frame_type(self.epsg_out)
 
+        # Fetched grids, keyed by (provider, name); region/nx/ny are fixed per instance
+        self._grid_cache = {}
+
         
     # =========================================================================
     # Data Fetching
@@ -94,20 +117,33 @@ class VerticalTransform:
 
     
     def _get_grid(self, provider, name):
-        """Helper to fetch and interpolate a grid."""
+        """Helper to fetch and interpolate a grid.
+        Grids are cached per instance and returned read-only.
+        """
         
-        if not name: return np.zeros((self.ny, self.nx))        
+        if not name: return None
         if not provider: provider = 'proj'
 
         if 'geoid=' in name: name = name[6:]
 
+        key = (provider, name)
+        if key in self._grid_cache:
+            return self._grid_cache[key]
+        
+        grid = None
         files = self.fetch_grid(provider, datatype=name, query=name)
         if not files:
             # we should try to check other providers here just in case...
             logger.warning(f"No grids found for {name} via {provider}")
-            return np.zeros((self.ny, self.nx))
-            
-        return GridEngine.load_and_interpolate(files, self.region, self.nx, self.ny)
+        else:
+            # Vertical shifts don't need more than float32
+            grid = GridEngine.load_and_interpolate(files, self.region, self.nx, self.ny)
+            if grid is not None:
+                grid = np.asarray(grid, dtype=np.float32)
+                grid.setflags(write=False)
+
+        self._grid_cache[key] = grid
+        return grid
 
     
     # =========================================================================
@@ -119,32 +155,30 @@ class VerticalTransform:
         Equation: Hub_Z = Tidal_Z + Tidal_Sep + TSS + Geoid_N
         """
         
-        total_shift = np.zeros((self.ny, self.nx))
+        total_shift = None
         desc = []
 
         # Tidal -> LMSL (Add Separation)
         # mllw.gtx is positive (LMSL is above MLLW)
         if datum_name not in ['msl', '5714', 'lmsl']:
             grid = self._get_grid('vdatum', datum_name)
-            total_shift += grid
+            total_shift = _accumulate(total_shift, grid)
             desc.append(f"({datum_name}->LMSL)")
 
         # LMSL -> Ortho (Add TSS)
         # tss.gtx is positive (NAVD88 is above LMSL usually? VDatum convention: TSS = NAVD88 - LMSL)
         # So LMSL + TSS = NAVD88
         tss = self._get_grid('vdatum', 'tss')
-        total_shift += tss
+        total_shift = _accumulate(total_shift, tss)
         desc.append("TSS")
 
         # Ortho -> Ellipsoid (Add Geoid N)
         # N is negative. Ortho + N = Ellipsoid.
         actual_geoid = geoid_name if geoid_name else 'g2018'
         
-        geoid_def = Datums.GEOIDS.get(actual_geoid, {})
-        provider = geoid_def.get('provider', 'proj')
-        
+        provider = Datums.GEOID_PROVIDER.get(actual_geoid, 'proj')
         geoid = self._get_grid(provider, actual_geoid)
-        total_shift += geoid
+        total_shift = _accumulate(total_shift, geoid)
         desc.append(f"Geoid({actual_geoid})")
         
         return total_shift, " + ".join(desc)
@@ -154,32 +188,35 @@ class VerticalTransform:
         """Calculate Ellipsoid Frame/Epoch shift."""
         
         if epsg_from == epsg_to and epoch_from == epoch_to:
-            return np.zeros((self.ny, self.nx))
+            return None
             
         from . import htdp
         try:
             tool = htdp.HTDP(verbose=False)
-            return tool.run_grid(self.region, self.nx, self.ny, epsg_from, epsg_to, epoch_from, epoch_to)
+            grid = tool.run_grid(self.region, self.nx, self.ny, epsg_from, epsg_to, epoch_from, epoch_to)
+            return None if grid is None else np.asarray(grid, dtype=np.float32)
         except Exception:
-            return np.zeros((self.ny, self.nx))
+            return None
 
         
     # =========================================================================
     # The Transformation
     # =========================================================================
     def _step_to_hub(self, epsg, ref_type, geoid=None, epoch=None):
-        """Calculate shift FROM Input TO Hub (NAD83_2011)."""
+        """Calculate shift FROM Input TO Hub (NAD83_2011).
+        Returns (shift, sign, desc); a shift of None means no (zero) shift.
+        """
         
-        shift = np.zeros((self.ny, self.nx))
+        shift = None
         desc = ""
 
         if epsg == HUB_EPSG and epoch == 1997.0:
-            return shift, "Already at Hub"
+            return shift, 1, "Already at Hub"
 
         if ref_type == 'surface':
             # Tidal -> [LMSL -> Ortho -> Geoid] -> Hub
             # Hub = Input + Chain
-            datum_name = Datums.SURFACES[epsg]['name']
+            datum_name = Datums.SURFACES[epsg].name
             chain_shift, chain_desc = self._get_vdatum_chain(datum_name, geoid)
             
             shift = chain_shift
@@ -188,8 +225,7 @@ class VerticalTransform:
         elif ref_type == 'cdn':
             # Ortho -> Hub (Ellipsoid = Ortho + Geoid)
             if geoid:
-                geoid_def = Datums.GEOIDS.get(geoid, {})
-                provider = geoid_def.get('provider', 'proj')
+                provider = Datums.GEOID_PROVIDER.get(geoid, 'proj')
                 shift = self._get_grid(provider, geoid)
                 desc = f"Ortho(via {geoid}) -> Hub [Geoid Add]"
             else:
@@ -200,39 +236,40 @@ class VerticalTransform:
             shift = self._get_htdp_shift(epsg, HUB_EPSG, epoch, 1997.0)
             desc = f"Ellipsoid({epsg}@{epoch}) -> Hub [HTDP]"
 
-        return shift, desc
+        return shift, 1, desc
 
     
     def _step_from_hub(self, epsg, ref_type, geoid=None, epoch=None):
         """Calculate shift FROM Hub (NAD83_2011) TO Output.
-        Output_Z = Hub_Z + Shift
+        Output_Z = Hub_Z + sign * Shift
+        Returns (shift, sign, desc); a shift of None means no (zero) shift.
         """
         
-        shift = np.zeros((self.ny, self.nx))
+        shift = None
+        sign = 1
         desc = ""
 
         if epsg == HUB_EPSG and epoch == 1997.0:
-            return shift, "Remain at Hub"
+            return shift, sign, "Remain at Hub"
 
         if ref_type == 'surface':
             # Hub -> Tidal
             # Inverse of Chain: Tidal = Hub - Chain
-            datum_name = Datums.SURFACES[epsg]['name']
+            datum_name = Datums.SURFACES[epsg].name
             chain_geoid = geoid if geoid else 'g2018'
             
             chain_shift, chain_desc = self._get_vdatum_chain(datum_name, chain_geoid)
             
-            shift = chain_shift * -1
+            shift = chain_shift
+            sign = -1
             desc = f"Hub -> Tidal({datum_name}) [Subtract Chain: {chain_desc}]"
 
         elif ref_type == 'cdn':
             # Hub -> Ortho (Ortho = Ellipsoid - Geoid)
             target_geoid = geoid if geoid else 'g2018'
-            geoid_def = Datums.GEOIDS.get(target_geoid, {})
-            provider = geoid_def.get('provider', 'proj')
-            grid = self._get_grid(provider, target_geoid)
-            
-            shift = grid * -1
+            provider = Datums.GEOID_PROVIDER.get(target_geoid, 'proj')
+            shift = self._get_grid(provider, target_geoid)
+            sign = -1
             desc = f"Hub -> Ortho(via {target_geoid}) [Geoid Subtract]"
 
         elif ref_type == 'htdp':
@@ -240,7 +277,7 @@ class VerticalTransform:
             shift = self._get_htdp_shift(HUB_EPSG, epsg, 1997.0, epoch)
             desc = f"Hub -> Ellipsoid({epsg}@{epoch}) [HTDP]"
 
-        return shift, desc    
+        return shift, sign, desc    
 
     
     def _vertical_transform(self, epsg_in, epsg_out):
@@ -249,29 +286,33 @@ class VerticalTransform:
         logger.info("-" * 60)
         logger.info(f"Transformation Plan: EPSG:{self.epsg_in} -> EPSG:{self.epsg_out}")
         
-        total_shift = np.zeros((self.ny, self.nx))
-        total_unc = np.zeros((self.ny, self.nx)) 
+        total_shift = None
+        total_unc = np.zeros((self.ny, self.nx), dtype=np.float32) 
 
         if self.epsg_in == self.epsg_out and self.epoch_in == self.epoch_out and self.geoid_in == self.geoid_out:
             logger.info("  1. Identity Transform (Zero Shift)")
-            return total_shift, total_unc
+            return np.zeros((self.ny, self.nx), dtype=np.float32), total_unc
 
         # 1. Input -> Hub
-        grid_1, desc_1 = self._step_to_hub(self.epsg_in, self.ref_in, self.geoid_in, self.epoch_in)
-        if np.any(grid_1):
+        grid_1, sign_1, desc_1 = self._step_to_hub(self.epsg_in, self.ref_in, self.geoid_in, self.epoch_in)
+        # A zero shift comes back as None, no need to scan the grid
+        if grid_1 is not None:
             logger.info(f"  1. {desc_1}")
-            total_shift += grid_1
+            total_shift = _accumulate(total_shift, grid_1, sign_1)
         else:
             logger.info(f"  1. {desc_1} (No Shift/Zero)")
 
         # 2. Hub -> Output
-        grid_2, desc_2 = self._step_from_hub(self.epsg_out, self.ref_out, self.geoid_out, self.epoch_out)
-        if np.any(grid_2):
+        grid_2, sign_2, desc_2 = self._step_from_hub(self.epsg_out, self.ref_out, self.geoid_out, self.epoch_out)
+        if grid_2 is not None:
             logger.info(f"  2. {desc_2}")
-            total_shift += grid_2
+            total_shift = _accumulate(total_shift, grid_2, sign_2)
         else:
             logger.info(f"  2. {desc_2} (No Shift/Zero)")
 
         logger.info("-" * 60)
-        
+
+        if total_shift is None:
+            total_shift = np.zeros((self.ny, self.nx), dtype=np.float32)
+            
         return total_shift, total_unc
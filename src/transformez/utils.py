@@ -11,16 +11,60 @@ This holds various utility functions.
 :license: MIT, see LICENSE for more details.
 """
 
-import os
+import re
+import shutil
 import subprocess
 import logging
+import functools
+
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
-def run_cmd(args):
-    """Standalone replacement for utils.run_cmd using subprocess."""
+# Increment strings: a number with an optional unit suffix, e.g. "0.0001", "1s", "3c", "1m", "30t"
+# s/c: arc-seconds, m: arc-minutes, d: degrees, t: meters (approximated at 111320 m/degree)
+_INC_RE = re.compile(r'^\s*([0-9]*\.?[0-9]+(?:[eE][-+]?[0-9]+)?)\s*([scmdt]?)\s*$', re.IGNORECASE)
+_INC_UNITS = {'s': 1/3600., 'c': 1/3600., 'm': 1/60., 'd': 1., 't': 1/111320., '': 1.}
+
+def parse_increment(inc_str):
+    """Parse an increment string into (inc_x, inc_y) in degrees.
+    Format: "INC" or "XINC/YINC", where INC may end in s/c (arc-seconds),
+    m (arc-minutes), d (degrees) or t (meters, at 111320 m/degree).
+    """
+
+    incs = []
+    for part in inc_str.split('/', 1):
+        m = _INC_RE.match(part)
+        if m is None:
+            raise ValueError(f'could not parse increment {part}')
+        
+        incs.append(float(m.group(1)) * _INC_UNITS[m.group(2).lower()])
+
+    return incs[0], incs[-1]
+
+
+def run_cmd(args, stream=False, capture=True):
+    """Standalone replacement for utils.run_cmd using subprocess.
+
+    If `stream` is True, return a generator over the raw stdout lines (bytes)
+    instead of (stdout, returncode), so large tool output is never buffered
+    and decoded as a whole. If `capture` is False, the output is discarded
+    and stdout is returned as ''.
+    """
     
     logger.info(f'Running: {" ".join(args) if isinstance(args, list) else args}')
+
+    if stream:
+        return _stream_cmd(args)
+    
+    if not capture:
+        result = subprocess.run(
+            args,
+            shell=False if isinstance(args, list) else True,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL
+        )
+        return '', result.returncode
     
     result = subprocess.run(
         args, 
@@ -30,8 +74,29 @@ def run_cmd(args):
     )
     return result.stdout, result.returncode
 
-cmd_exists = lambda x: any(os.access(os.path.join(path, x), os.X_OK) 
-                           for path in os.environ['PATH'].split(os.pathsep))
+
+def _stream_cmd(args):
+    """Yield stdout lines of `args` as they are produced."""
+    
+    with subprocess.Popen(
+            args,
+            shell=False if isinstance(args, list) else True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL
+    ) as proc:
+        for line in proc.stdout:
+            yield line
+            
+    if proc.returncode != 0:
+        logger.warning(f'Command exited with status {proc.returncode}')
+
+        
+@functools.lru_cache(maxsize=None)
+def cmd_exists(x):
+    """Check if `x` is an executable on the PATH (cached per process)."""
+    
+    return shutil.which(x) is not None
+
 
 def cmd_check(cmd_str, cmd_vers_str):
     """check system for availability of 'cmd_str'"""
@@ -40,3 +105,27 @@ def cmd_check(cmd_str, cmd_vers_str):
         cmd_vers, status = run_cmd(f'{cmd_vers_str}')
         return cmd_vers.rstrip()
     return b"0"
+
+
+@functools.lru_cache(maxsize=32)
+def _index_vector(n):
+    """Cached, read-only `np.arange(n)` as float64."""
+    
+    idx = np.arange(n, dtype=np.float64)
+    idx.flags.writeable = False
+    return idx
+
+
+def axis_nodes(start, stop, n):
+    """Equivalent of np.linspace(start, stop, n) built from a cached index vector."""
+
+    if n < 2:
+        return np.full(n, float(start))
+    
+    return start + ((stop - start) / (n - 1)) * _index_vector(n)
+
+
+def axis_centers(start, step, n):
+    """Pixel-center coordinates: start + step * (i + 0.5) for i in range(n)."""
+
+    return start + step * (_index_vector(n) + 0.5)
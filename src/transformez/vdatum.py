@@ -12,15 +12,242 @@ This wraps the NGS 'VDatum' tool.
 """
 
 import os
+import json
+import shutil
 import logging
+import subprocess
+import concurrent.futures
+import zipfile
+import tempfile
+import threading
+import weakref
+import functools
+
+import numpy as np
 
 from . import utils
 
 logger = logging.getLogger(__name__)
 
-vdatum_cmd = 'vdatum.jar -v'
-HAS_VDATUM = utils.cmd_check('vdatum.jar', vdatum_cmd).decode()
+# VDatum's output value for points it could not transform
+VDATUM_NODATA = -999999
+
+# Distinct points remembered per Vdatum by vdatum_xyz
+VDATUM_XYZ_CACHE_SIZE = 100_000
+
+# tmpfs for scratch point/result files, when available
+VDATUM_SCRATCH_ROOT = '/dev/shm'
+
+VDATUM_CACHE = os.path.join(os.path.expanduser('~'), '.transformez', 'vdatum.json')
+
+# Usual install locations, checked before searching the filesystem
+VDATUM_JAR_DIRS = ['/opt/vdatum', '/usr/local/vdatum', '~/vdatum', './vdatum']
+
+# Seconds to allow the last-resort filesystem search for vdatum.jar
+VDATUM_FIND_TIMEOUT = 60
+
+def _read_vdatum_cache():
+    try:
+        with open(VDATUM_CACHE, 'r') as f:
+            cached = json.load(f)
+            
+        return cached if isinstance(cached, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_vdatum_cache(**kwargs):
+    cached = _read_vdatum_cache()
+    cached.update(kwargs)
+    try:
+        os.makedirs(os.path.dirname(VDATUM_CACHE), exist_ok=True)
+        with open(VDATUM_CACHE, 'w') as f:
+            json.dump(cached, f)
+    except OSError:
+        pass
+
+    
+def _find_vdatum_jar(search_fs=True):
+    """Locate vdatum.jar.
+
+    Checks the cached path, $VDATUM_JAR, the PATH and the usual install
+    directories; only if all of those miss (and `search_fs` is set) is the
+    filesystem searched. A found jar is cached for later runs.
+    """
+
+    cached = _read_vdatum_cache().get('jar')
+    if cached and os.path.isfile(cached):
+        return cached
+
+    candidates = [os.environ.get('VDATUM_JAR'), shutil.which('vdatum.jar')]
+    candidates += [os.path.join(os.path.expanduser(d), 'vdatum.jar') for d in VDATUM_JAR_DIRS]
+    jar = next((c for c in candidates if c and os.path.isfile(c)), None)
+    
+    if jar is None and search_fs:
+        # find stops at the first hit; -xdev keeps it off network/other mounts
+        try:
+            out = subprocess.run(
+                ['find', '/', '-xdev', '-name', 'vdatum.jar', '-print', '-quit'],
+                capture_output=True, text=True, timeout=VDATUM_FIND_TIMEOUT
+            ).stdout.strip()
+            jar = out.splitlines()[0] if out else None
+        except (OSError, subprocess.TimeoutExpired):
+            jar = None
 
+    if jar is not None:
+        jar = os.path.abspath(jar)
+        _write_vdatum_cache(jar=jar)
+        
+    return jar
+
+
+@functools.lru_cache(maxsize=8)
+def _jar_main_class(jar):
+    """Read the Main-Class from the jar's manifest, or None."""
+
+    try:
+        with zipfile.ZipFile(jar) as zf:
+            manifest = zf.read('META-INF/MANIFEST.MF').decode('utf-8', 'replace')
+    except (OSError, KeyError, zipfile.BadZipFile):
+        return None
+
+    for line in manifest.splitlines():
+        if line.startswith('Main-Class:'):
+            return line.split(':', 1)[1].strip() or None
+        
+    return None
+
+
+@functools.lru_cache(maxsize=8)
+def _java_argv(jar):
+    """The java argv prefix for running `jar`, tokenized once per jar.
+
+    Runs the manifest's main class straight off the classpath when it is
+    known (skipping the -jar launcher's manifest handling) and lets the JVM
+    reuse its class-data-sharing archive between runs.
+    """
+
+    main_class = _jar_main_class(jar)
+    if main_class is None:
+        return ('java', '-Xshare:auto', '-jar', jar)
+    
+    return ('java', '-Xshare:auto', '-cp', jar, main_class)
+
+
+def _probe_vdatum_version(jar):
+    """Run vdatum and attempt to get its version."""
+
+    out, _ = utils.run_cmd([*_java_argv(jar), '-'])
+    for i in out.split('\n'):
+        if '- v' in i.strip():
+            return i.strip().split('v')[-1]
+        
+    return None
+
+
+def _vdatum_version(jar):
+    """The vdatum version for `jar`, cached on disk against the jar's path and mtime
+    so the JVM only has to be started once per install.
+    """
+
+    try:
+        jar_mtime = os.stat(jar).st_mtime
+    except OSError:
+        return None
+
+    cached = _read_vdatum_cache()
+    if cached.get('version_jar') == jar and cached.get('jar_mtime') == jar_mtime \
+       and cached.get('version') is not None:
+        return cached['version']
+
+    version = _probe_vdatum_version(jar)
+    # a failed probe isn't cached, so the next run tries again
+    if version is not None:
+        _write_vdatum_cache(version_jar=jar, jar_mtime=jar_mtime, version=version)
+        
+    return version
+
+
+def _load_or_probe():
+    """Version of the locally available vdatum, or '0'.
+    Only cheap jar lookups are done here, no filesystem search.
+    """
+    
+    jar = _find_vdatum_jar(search_fs=False)
+    version = _vdatum_version(jar) if jar is not None else None
+    return version or '0'
+
+
+HAS_VDATUM = _load_or_probe()
+
+## ==============================================
+## Optional in-process JVM (JPype)
+## One JVM per process, shared by all Vdatum instances;
+## a JVM can't be restarted or given a new classpath once up.
+## ==============================================
+_JVM_LOCK = threading.Lock()
+_JVM_JAR = None
+
+def _jvm_main(jar, args):
+    """Call the jar's main class with `args` in the shared JPype JVM.
+
+    Returns False if JPype isn't installed, the JVM can't be used for this
+    jar, or main() throws, so the caller can fall back to a subprocess.
+    """
+
+    global _JVM_JAR
+    try:
+        import jpype
+    except ImportError:
+        return False
+
+    main_class = _jar_main_class(jar)
+    if main_class is None:
+        return False
+    
+    with _JVM_LOCK:
+        if not jpype.isJVMStarted():
+            jpype.startJVM(classpath=[jar], convertStrings=False)
+            _JVM_JAR = jar
+        elif _JVM_JAR != jar:
+            return False
+
+        try:
+            jpype.JClass(main_class).main(jpype.JArray(jpype.JString)(args))
+        except jpype.JException as e:
+            # a Java exception isn't an OSError/ValueError; retry as a subprocess
+            logger.warning(f'vdatum failed in the JVM, falling back to a subprocess: {e}')
+            return False
+        
+    return True
+
+
+def _load_xyz(fn, skip=0):
+    """Load the x, y, z columns of a (space delimited) vdatum result file."""
+
+    return np.loadtxt(fn, usecols=(0, 1, 2), skiprows=skip, ndmin=2)
+
+
+def _merge_result(xyzs, out):
+    """Take vdatum's output for `xyzs`, keeping the input z where vdatum gave none."""
+
+    if out is None:
+        return xyzs.copy()
+
+    if out.shape != xyzs.shape:
+        logger.error(f'vdatum returned {len(out)} points for {len(xyzs)} inputs, keeping the input z')
+        return xyzs.copy()
+
+    out[:, 2] = np.where(out[:, 2] == VDATUM_NODATA, xyzs[:, 2], out[:, 2])
+    return out
+
+
+def _remove_files(fns):
+    for fn in fns:
+        if os.path.exists(fn):
+            os.remove(fn)
+
+            
 ## ==============================================
 ## NOAA's VDATUM Wrapper
 ## ==============================================
@@ -28,7 +255,7 @@ class Vdatum:
     def __init__(self, jar=None, ivert='navd88:m:height', overt='mhw:m:height',
                  ihorz='NAD83_2011', ohorz='NAD83_2011', region='4', fmt='txt',
                  xyzl='0,1,2', skip=0, delim='space', result_dir='result',
-                 verbose=False):
+                 jvm=False, verbose=False):
         self.jar = jar
         self.ivert = ivert
         self.overt = overt
@@ -40,10 +267,29 @@ class Vdatum:
         self.skip = skip
         self.delim = delim
         self.result_dir = result_dir
+        # scratch dirs for the internal point runs; run_vdatum() itself writes to result_dir
+        self._input_dir = None
+        self._output_dir = result_dir
+        self.jvm = jvm # run vdatum in a resident JPype JVM, if available
         self.verbose = verbose
         self.epoch = None
+        self._version = None
+        self._xyz_cache = {}
         self.vdatum_set_horz()
 
+        # Keep the point-run scratch files in memory (tmpfs) rather than on disk
+        if os.path.isdir(VDATUM_SCRATCH_ROOT):
+            try:
+                scratch = tempfile.mkdtemp(prefix='vdatum_', dir=VDATUM_SCRATCH_ROOT)
+            except OSError:
+                scratch = None
+                
+            if scratch is not None:
+                self._output_dir = os.path.join(scratch, 'result')
+                self._input_dir = os.path.join(scratch, 'input')
+                os.makedirs(self._input_dir)
+                weakref.finalize(self, shutil.rmtree, scratch, True)
+
         
     def vdatum_set_horz(self):
         if 'ITRF' in self.overt:
@@ -54,78 +300,230 @@ class Vdatum:
     def vdatum_locate_jar(self):
         """Find the VDatum executable on the local system."""
         
-        results = []
-        for root, dirs, files in os.walk('/'):
-            if 'vdatum.jar' in files:
-                results.append(os.path.abspath(os.path.join(root, 'vdatum.jar')))
-                break
-        if not results:
+        jar = _find_vdatum_jar()
+        if jar is None:
             return None
         else:
-            self.jar = results[0]
-            return results
+            self.jar = jar
+            return [jar]
 
         
     def vdatum_get_version(self):
         """Run vdatum and attempt to get its version."""
         
+        if self._version is not None:
+            return self._version
+        
         if self.jar is None:
             self.vdatum_locate_jar()
         if self.jar is not None:
-            out, _ = utils.run_cmd(f'java -jar {self.jar} -', verbose=self.verbose)
-            for i in out.decode('utf-8').split('\n'):
-                if '- v' in i.strip():
-                    return i.strip().split('v')[-1]
-        return None
+            self._version = _vdatum_version(self.jar)
+            
+        return self._version
 
     
     def vdatum_xyz(self, xyz):
-        """Run vdatum on an xyz list [x, y, z]."""
+        """Run vdatum on an xyz list [x, y, z].
+
+        Kept for single-point callers; use `vdatum_xyzs` or
+        `vdatum_xyz_arrays` for many points.
+        """
+
+        if self.jar is None:
+            self.vdatum_locate_jar()
+        if self.jar is None:
+            return xyz
+
+        # Repeat queries (same point, same settings) are answered from a per-instance
+        # cache of z shifts; only successful transforms are kept.
+        key = (round(xyz[0], 7), round(xyz[1], 7), round(xyz[2], 4),
+               self.ivert, self.overt, self.ihorz, self.ohorz, self.region, self.epoch)
+        shift = self._xyz_cache.get(key)
+        if shift is None:
+            try:
+                out = self._run_points(np.array([key[:3]], dtype=np.float64))
+            except (OSError, ValueError) as e:
+                logger.error(f'Could not transform point with vdatum: {e}')
+                return xyz
+
+            if out[0, 2] == VDATUM_NODATA:
+                return xyz
+
+            shift = float(out[0, 2] - key[2])
+            if len(self._xyz_cache) >= VDATUM_XYZ_CACHE_SIZE:
+                # dicts keep insertion order, so this drops the oldest entry
+                del self._xyz_cache[next(iter(self._xyz_cache))]
+
+            self._xyz_cache[key] = shift
+
+        return [xyz[0], xyz[1], xyz[2] + shift]
+
+    
+    def vdatum_xyzs(self, xyzs):
+        """Run vdatum on a list of xyz points [[x, y, z], ...].
+
+        All the points go through one file-mode vdatum run (one JVM start)
+        rather than one run per point. Points vdatum can't transform keep
+        their input z.
+        """
+
+        return self._vdatum_points(np.asarray(xyzs, dtype=np.float64).reshape(-1, 3)).tolist()
+
+    
+    def vdatum_xyz_arrays(self, x, y, z):
+        """Run vdatum on points held as separate x, y and z arrays.
+
+        Returns:
+            tuple: (x_out, y_out, z_out) float64 arrays.
+        """
+
+        xyzs = np.column_stack([
+            np.asarray(x, dtype=np.float64).ravel(),
+            np.asarray(y, dtype=np.float64).ravel(),
+            np.asarray(z, dtype=np.float64).ravel()
+        ])
+        out = self._vdatum_points(xyzs)
+        return tuple(np.ascontiguousarray(col) for col in out.T)
+
+    
+    def _vdatum_points(self, xyzs):
+        """One file-mode vdatum run over an (N, 3) float64 array; returns an (N, 3) array."""
         
         if self.jar is None:
             self.vdatum_locate_jar()
-        if self.jar is not None:
-            epoch_str = f'epoch:{self.epoch} ' if self.epoch is not None else ''
-            vdc = (f'ihorz:{self.ihorz} ivert:{self.ivert} ohorz:{self.ohorz} overt:{self.overt} '
-                   f'-nodata -pt:{xyz[0]},{xyz[1]},{xyz[2]} {epoch_str}region:{self.region}')
+        if self.jar is None or len(xyzs) == 0:
+            return xyzs
+
+        try:
+            out = self._run_points(xyzs)
+        except (OSError, ValueError) as e:
+            logger.error(f'Could not transform points with vdatum: {e}')
+            return xyzs
+
+        return _merge_result(xyzs, out)
+
+    
+    def _run_points(self, xyzs):
+        """File-mode vdatum run over an (N, 3) float64 array, returning vdatum's raw (N, 3) output.
+        Raises OSError/ValueError if the run or its result file fails.
+        """
+
+        src_fn = self._write_points(xyzs)
+        try:
+            self.run_vdatum(src_fn, delim='space', xyzl='0,1,2', skip=0, result_dir=self._output_dir)
+            out = self._load_result(src_fn)
+            if out.shape != xyzs.shape:
+                raise ValueError(f'expected {len(xyzs)} points, got {len(out)}')
+        finally:
+            _remove_files([src_fn, self._result_fn(src_fn)])
+
+        return out
+
+    
+    def vdatum_xyzs_parallel(self, xyzs, workers=os.cpu_count(), chunk=50_000):
+        """Run vdatum on a large list of xyz points, in shards of at most
+        `chunk` points with up to `workers` vdatum runs going at once.
+
+        Each vdatum run is its own JVM process, so the shards are driven
+        from threads, and every finished shard is parsed right away while
+        the remaining runs keep going.
+        """
+
+        xyzs = np.asarray(xyzs, dtype=np.float64).reshape(-1, 3)
+        if self.jar is None:
+            self.vdatum_locate_jar()
             
-            out, _ = utils.run_cmd(
-                f'java -Djava.awt.headless=false -jar {self.jar} {vdc}',
-                verbose=False
-            )
-            z = xyz[2]
-            for i in out.split('\n'):
-                if 'Height/Z' in i:
+        n_shards = -(-len(xyzs) // chunk)
+        if self.jar is None or n_shards <= 1 or (workers or 1) <= 1:
+            return self._vdatum_points(xyzs).tolist()
+
+        shards = np.array_split(xyzs, n_shards)
+        src_fns = [self._write_points(shard) for shard in shards]
+        # one result_dir per shard so concurrent runs don't collide
+        result_dirs = [f'{self._output_dir}_{i}' for i in range(n_shards)]
+        result_fns = [os.path.join(d, os.path.basename(fn)) for d, fn in zip(result_dirs, src_fns)]
+        outs = [None] * n_shards
+        try:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=min(workers, n_shards)) as executor:
+                futures = {
+                    executor.submit(
+                        self.run_vdatum, src_fn, delim='space', xyzl='0,1,2', skip=0, result_dir=result_dir
+                    ): i for i, (src_fn, result_dir) in enumerate(zip(src_fns, result_dirs))
+                }
+                for future in concurrent.futures.as_completed(futures):
+                    i = futures[future]
+                    # a failed shard keeps its input z, the same as the serial path
                     try:
-                        z = float(i.split()[2])
-                        break
-                    except ValueError:
-                        pass
-            return [xyz[0], xyz[1], z]
-        else: 
-            return xyz
+                        future.result()
+                        outs[i] = _load_xyz(result_fns[i])
+                    except (OSError, ValueError) as e:
+                        logger.error(f'Could not transform shard {i} with vdatum: {e}')
+        finally:
+            _remove_files(src_fns + result_fns)
+            for result_dir in result_dirs:
+                try:
+                    os.rmdir(result_dir)
+                except OSError:
+                    pass
+
+        return np.vstack([_merge_result(shard, out) for shard, out in zip(shards, outs)]).tolist()
 
         
+    def _write_points(self, xyzs):
+        """Write an (N, 3) array of points to a temporary space-delimited file."""
+        
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.xyz', dir=self._input_dir, delete=False) as tmp:
+            np.savetxt(tmp, xyzs, fmt='%.10g', delimiter=' ')
+            
+        return tmp.name
+
+    
+    def _result_fn(self, src_fn):
+        """Where an internal point run writes the results for `src_fn`."""
+
+        return os.path.join(self._output_dir, os.path.basename(src_fn))
+
+    
+    def _load_result(self, src_fn, skip=0):
+        """Load the x, y, z columns of the vdatum result for `src_fn` (space delimited)."""
+
+        return _load_xyz(self._result_fn(src_fn), skip=skip)
+
+    
     def vdatum_clean_result(self):
         """Clean the vdatum 'result' folder."""
-        
-        utils.remove_glob(f'{self.result_dir}/*')
-        try:
-            os.removedirs(self.result_dir)
-        except OSError: 
-            pass
+
+        shutil.rmtree(self.result_dir, ignore_errors=True)
 
         
-    def run_vdatum(self, src_fn):
-        """Run vdatum on src_fn which is an XYZ file."""
+    def run_vdatum(self, src_fn, delim=None, xyzl=None, skip=None, result_dir=None):
+        """Run vdatum on src_fn which is an XYZ file.
+        `delim`, `xyzl`, `skip` and `result_dir` override the instance settings for this file.
+        """
         
         if self.jar is None:
             self.vdatum_locate_jar()
         if self.jar is not None:
-            epoch_str = f'epoch:{self.epoch} ' if self.epoch is not None else ''
-            vdc = (f'ihorz:{self.ihorz} ivert:{self.ivert} ohorz:{self.ohorz} overt:{self.overt} '
-                   f'-nodata -file:txt:{self.delim},{self.xyzl},skip{self.skip}:{src_fn}:{self.result_dir} '
-                   f'{epoch_str}region:{self.region}')
-            return utils.run_cmd(f'java -jar {self.jar} {vdc}', verbose=self.verbose)
+            delim = self.delim if delim is None else delim
+            xyzl = self.xyzl if xyzl is None else xyzl
+            skip = self.skip if skip is None else skip
+            result_dir = self.result_dir if result_dir is None else result_dir
+            
+            # argument list, no shell: paths and delimiters need no quoting
+            # built from the current settings on every run, so changes to
+            # e.g. region/epoch/overt on an existing instance take effect
+            vdc = [f'ihorz:{self.ihorz}', f'ivert:{self.ivert}', f'ohorz:{self.ohorz}', f'overt:{self.overt}',
+                   '-nodata', f'-file:txt:{delim},{xyzl},skip{skip}:{src_fn}:{result_dir}']
+            if self.epoch is not None:
+                vdc.append(f'epoch:{self.epoch}')
+                
+            vdc.append(f'region:{self.region}')
+            
+            # results go to result_dir, so there is no output to capture from the JVM
+            if self.jvm and _jvm_main(self.jar, vdc):
+                return '', 0
+            
+            # Results are read from result_dir; only keep the tool's output when verbose
+            return utils.run_cmd([*_java_argv(self.jar), *vdc], capture=self.verbose)
         else: 
             return [], -1